@@ -0,0 +1,218 @@
+import json
+import time
+import random
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+# --- FIXTURE SITES ---
+# A local HTTP server with synthetic OddMenu- and FineDine-shaped pages, using the same
+# markup the scrapers select on. Menus are generated deterministically from the config,
+# so every run (and every commit) scrapes exactly the same data.
+#   /oddmenu/<slug>               landing page; tabs switch the category list client-side
+#   /oddmenu/<slug>/c/<tab>/<cat> category page with the dishes
+#   /finedine/<slug>              single page with category headers and dish cards
+#   /img/<key>.jpg                image of `image_bytes` bytes
+FIXTURE_SIZES = {
+    "small": {"tabs": 2, "categories": 3, "dishes": 10},
+    "medium": {"tabs": 3, "categories": 6, "dishes": 25},
+    "large": {"tabs": 4, "categories": 10, "dishes": 60},
+}
+
+DEFAULT_FIXTURE = {
+    "tabs": 2,              # OddMenu only; FineDine pages show tabs * categories categories
+    "categories": 3,        # Per tab
+    "dishes": 10,           # Per category
+    "images": 1.0,          # Share of dishes that have an image
+    "image_bytes": 40000,
+    "latency_ms": 0,        # Added to every response
+    "lazy_batch": 0,        # Dishes rendered up front; more appear on scroll (0 = all at once)
+    "lazy_delay_ms": 150,   # Client-side delay before the next lazy batch (and tab switches)
+    "embed_json": False,    # Ship the menu as __NEXT_DATA__ so the fast path can read it
+}
+
+def fixture_config(size=None, **overrides):
+    config = dict(DEFAULT_FIXTURE)
+    if size: config.update(FIXTURE_SIZES[size])
+    config.update({k: v for k, v in overrides.items() if v is not None})
+    return config
+
+def build_menu(slug, config, base_url):
+    # [{'name', 'categories': [{'name', 'dishes': [{'name', 'description', 'price', 'currency', 'image'}]}]}]
+    rng = random.Random(slug)
+    tabs = []
+    for t in range(config["tabs"]):
+        categories = []
+        for c in range(config["categories"]):
+            dishes = []
+            for d in range(config["dishes"]):
+                has_image = rng.random() < config["images"]
+                dishes.append({
+                    "name": f"Dish {t + 1}-{c + 1}-{d + 1}",
+                    "description": f"Synthetic dish {d + 1} of category {c + 1}",
+                    "price": str(rng.randint(5, 250)),
+                    "currency": "AED",
+                    "image": f"{base_url}/img/{slug}-{t}-{c}-{d}.jpg" if has_image else "",
+                })
+            categories.append({"name": f"Category {t + 1}-{c + 1}", "dishes": dishes})
+        tabs.append({"name": f"Tab {t + 1}", "categories": categories})
+    return tabs
+
+# Dishes are rendered from JSON in the browser, like the real sites, optionally in
+# batches that only appear when the page is scrolled to the bottom.
+_LAZY_JS = """
+<script>
+const ITEMS = %(items)s, BATCH = %(batch)d || ITEMS.length, DELAY = %(delay)d;
+const root = document.getElementById('items');
+let shown = 0, loading = false;
+function more() {
+    const end = Math.min(ITEMS.length, shown + BATCH);
+    for (; shown < end; shown++) root.insertAdjacentHTML('beforeend', ITEMS[shown]);
+    loading = false;
+}
+window.addEventListener('scroll', () => {
+    if (loading || shown >= ITEMS.length) return;
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 50) { loading = true; setTimeout(more, DELAY); }
+});
+setTimeout(more, 0);
+</script>"""
+
+def _next_data(menu):
+    return ('<script id="__NEXT_DATA__" type="application/json">'
+            + json.dumps({"props": {"pageProps": {"menu": menu}}}) + "</script>")
+
+def _page(title, body, scripts=""):
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{title}</title>"
+            f"<style>.menu-item, button {{display: block; height: 120px}}</style></head>"
+            f"<body>{body}{scripts}</body></html>")
+
+def oddmenu_landing(slug, menu, config):
+    tabs = "".join(f"<li class='menu-list__item'><button class='menu__button'>{tab['name']}</button></li>" for tab in menu)
+    categories = [[{"name": cat["name"], "href": f"/oddmenu/{slug}/c/{t}/{c}"} for c, cat in enumerate(tab["categories"])]
+                  for t, tab in enumerate(menu)]
+    script = """
+<script>
+const CATEGORIES = %s, DELAY = %d;
+function show(t) {
+    document.getElementById('categories').innerHTML = CATEGORIES[t].map(c =>
+        `<div class="category-item"><a href="${c.href}"><h2>${c.name}</h2></a></div>`).join('');
+}
+document.querySelectorAll('.menu__button').forEach((b, i) => b.onclick = () => setTimeout(() => show(i), DELAY));
+setTimeout(() => show(0), 0);
+</script>""" % (json.dumps(categories), config["lazy_delay_ms"])
+    embedded = _next_data(menu) if config["embed_json"] else ""
+    return _page(f"{slug} | OddMenu", f"<ul class='menu-list'>{tabs}</ul><div id='categories'></div>", embedded + script)
+
+def oddmenu_category(slug, menu, config, t, c):
+    items = [
+        "<div class='menu-item'>"
+        f"<div class='menu-item-title'><span>{d['name']}</span></div>"
+        f"<div class='menu-item-description'><p>{d['description']}</p></div>"
+        f"<div class='menu-item-price__current'><b>{d['price']}</b><span>{d['price']} {d['currency']}</span></div>"
+        + (f"<a class='menu-item-image__preview-image-link'><img src='{d['image']}'></a>" if d['image'] else "")
+        + "</div>"
+        for d in menu[t]["categories"][c]["dishes"]
+    ]
+    script = _LAZY_JS % {"items": json.dumps(items), "batch": config["lazy_batch"], "delay": config["lazy_delay_ms"]}
+    return _page(f"{menu[t]['categories'][c]['name']} | {slug} | OddMenu", "<div id='items'></div>", script)
+
+def finedine_page(slug, menu, config):
+    items = []
+    n = 0
+    for tab in menu:
+        for cat in tab["categories"]:
+            items.append(f"<span class='text-xl font-bold text-center text-primary'>{cat['name']}</span>")
+            for d in cat["dishes"]:
+                image = f"<img src='{d['image']}' srcset='{d['image']} 1x, {d['image']} 2x'>" if d['image'] else ""
+                items.append(
+                    f"<button id='food-card-link-{n}'>{image}"
+                    f"<span class='text-primary text-base font-bold'>{d['name']}</span>"
+                    f"<span class='text-primary text-base font-normal line-clamp-2'>{d['description']}</span>"
+                    f"<span class='text-highlight_color'>{d['currency']} {d['price']}</span></button>"
+                )
+                n += 1
+    script = _LAZY_JS % {"items": json.dumps(items), "batch": config["lazy_batch"], "delay": config["lazy_delay_ms"]}
+    embedded = _next_data(menu) if config["embed_json"] else ""
+    body = f"<span class='text-3xl font-bold text-primary'>{slug} Menu</span><div id='items'></div>"
+    return _page(f"{slug} Menu | FineDine", body, embedded + script)
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True   # Headers and body go out in separate writes; avoid delayed-ACK stalls
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        config = server.config
+        if config["latency_ms"]: time.sleep(config["latency_ms"] / 1000)
+        parts = urlsplit(self.path).path.strip("/").split("/")
+        body, kind, content_type = None, "page", "text/html; charset=utf-8"
+
+        if parts[0] == "img" and len(parts) == 2:
+            kind, content_type = "image", "image/jpeg"
+            body = server.image(parts[1])
+        elif parts[0] in ("oddmenu", "finedine") and len(parts) >= 2:
+            menu = server.menu(parts[1])
+            if parts[0] == "finedine" and len(parts) == 2:
+                body = finedine_page(parts[1], menu, config)
+            elif len(parts) == 2:
+                body = oddmenu_landing(parts[1], menu, config)
+            elif len(parts) == 5 and parts[2] == "c":
+                t, c = int(parts[3]), int(parts[4])
+                if t < len(menu) and c < len(menu[t]["categories"]): body = oddmenu_category(parts[1], menu, config, t, c)
+
+        if body is None:
+            self.send_error(404)
+            return
+        if isinstance(body, str): body = body.encode("utf-8")
+        server.count(kind, len(body))
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config=None, port=0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.config = config or fixture_config()
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.stats = {'pages': 0, 'images': 0, 'bytes': 0}
+        self._menus = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+    def urls(self, platform, count):
+        # Restaurant URLs for "oddmenu" or "finedine"
+        return [f"{self.base_url}/{platform}/{platform}-{i + 1}" for i in range(count)]
+
+    def menu(self, slug):
+        with self._lock:
+            if slug not in self._menus: self._menus[slug] = build_menu(slug, self.config, self.base_url)
+            return self._menus[slug]
+
+    def image(self, key):
+        # Starts like a JPEG; the rest is filler
+        return b"\xff\xd8\xff\xe0" + (key.encode() * (self.config["image_bytes"] // max(1, len(key)) + 1))[:self.config["image_bytes"]]
+
+    def count(self, kind, size):
+        with self._lock:
+            self.stats['images' if kind == "image" else 'pages'] += 1
+            self.stats['bytes'] += size
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {'pages': 0, 'images': 0, 'bytes': 0}
@@ -0,0 +1,55 @@
+import sys
+import time
+import random
+import argparse
+
+from menuscraper.normalize import normalize_records
+
+# --- NORMALIZATION BENCHMARK ---
+# python -m benchmarks.normalize --rows 100000
+# Times normalize_records() on synthetic rows in the shapes both platforms produce
+# ("AED 45" / "NA", "1,250.00", Arabic-Indic digits, bilingual names, repeats).
+SHAPES = [
+    {'Dish': "Chicken Shawarma", 'Price': "45", 'Currency': "AED"},
+    {'Dish': "Mixed Grill", 'Price': "1,250.00", 'Currency': "NA"},
+    {'Dish': "Hummus حمص", 'Price': "٤٥", 'Currency': "د.إ"},
+    {'Dish': "Fries", 'Price': "AED 12.5", 'Currency': ""},
+    {'Dish': "Fish", 'Price': "Market price", 'Currency': "NA"},
+]
+
+def synthetic_rows(count, messy_share, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        shape = rng.choice(SHAPES[1:]) if rng.random() < messy_share else SHAPES[0]
+        rows.append(dict(shape, **{
+            'Restaurant': f"Restaurant {i // 500}",
+            'Tab': "Menu",
+            'Category': f"Category {i % 25}",
+            'Dish': f"{shape['Dish']} {i % 4000}",
+            'Description': "Served  with rice and salad",
+            'Image URL': f"https://images.example.com/{i}.jpg",
+            'Source': f"https://menu.example.com/{i // 500}",
+            'Platform': "FineDine" if i % 2 else "OddMenu",
+        }))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks.normalize", description="Time record normalization.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--messy", type=float, default=0.2, help="Share of rows that need the regex paths")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rows = synthetic_rows(args.rows, args.messy)
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        out = normalize_records(rows)
+        timings.append(time.perf_counter() - started)
+    print(f"{args.rows} rows ({args.messy:.0%} messy) -> {len(out)} after dedupe: "
+          f"best {min(timings):.2f}s, {args.rows / min(timings):,.0f} rows/s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from collections import deque
+
+from benchmarks.fixtures import FIXTURE_SIZES, FixtureServer, fixture_config
+
+# --- BENCHMARK RUNNER ---
+# python -m benchmarks.run --sizes small,medium --workers 1,4 --restaurants 4
+# Every (size, workers) combination scrapes the fixture sites end to end through
+# run_batch in a fresh child process, so peak RSS is per run and Playwright's protocol
+# log (DEBUG=pw:protocol, on the driver's stderr) can be counted to get the number of
+# browser round trips. Results are saved under benchmarks/results/<commit>.json.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+PROTOCOL_SEND = "SEND ►"
+
+def git_commit():
+    # Short hash of HEAD, with "+dirty" when the tree has uncommitted changes
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+        dirty = subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT, text=True).strip()
+        return commit + ("+dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def peak_rss_mb():
+    # (this process, its finished children) in MB; None where `resource` is unavailable
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    scale = 1 / 1_048_576 if sys.platform == "darwin" else 1 / 1024   # bytes on macOS, KB elsewhere
+    return (round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale, 1),
+            round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale, 1))
+
+def run_child(spec):
+    # Runs one scrape in this process and prints its result as JSON on stdout
+    from menuscraper.engine import prepare_output_dir, run_batch
+
+    jobs = [(i, url, "FineDine" if "finedine" in url else "OddMenu") for i, url in enumerate(spec['urls'])]
+    out_dir = os.path.join(spec['tmp'], "out")
+    prepare_output_dir(out_dir)
+    started = time.monotonic()
+    summary = None
+    for event in run_batch(
+        jobs,
+        out_dir=out_dir,
+        workers=spec['workers'],
+        platform_limits={"OddMenu": spec['workers'], "FineDine": spec['workers']},
+        fast_path={"OddMenu": spec['fast_path'], "FineDine": spec['fast_path']},
+        use_image_cache=False,
+        incremental=False,
+    ):
+        if event[0] == 'finished': summary = event[1]
+    wall_s = time.monotonic() - started
+    rss, rss_children = peak_rss_mb()
+    print(json.dumps({
+        'wall_s': round(wall_s, 2),
+        'items': summary['rows'],
+        'items_per_sec': round(summary['rows'] / wall_s, 1) if wall_s else 0,
+        'failed': summary['jobs']['failed'],
+        'images': summary['images']['downloaded'],
+        'image_mb': round(summary['images']['bytes'] / 1_048_576, 1),
+        'peak_rss_mb': rss,
+        'peak_rss_children_mb': rss_children,
+        'stages': {s['Stage']: {'p50_ms': s['p50 ms'], 'p95_ms': s['p95 ms'], 'total_s': s['Total s']}
+                   for s in summary['timings']['stages']},
+    }))
+
+def run_case(size, workers, args):
+    config = fixture_config(size, latency_ms=args.latency_ms, lazy_batch=args.lazy_batch,
+                            image_bytes=args.image_bytes, embed_json=args.fast_path)
+    with FixtureServer(config) as server, tempfile.TemporaryDirectory() as tmp:
+        urls = []
+        for name in args.platforms:
+            urls += server.urls(name, args.restaurants)
+        spec = {'urls': urls, 'workers': workers, 'fast_path': args.fast_path, 'tmp': tmp}
+        env = dict(os.environ, DEBUG="pw:protocol")
+        proc = subprocess.Popen([sys.executable, "-m", "benchmarks.run", "--child", json.dumps(spec)], cwd=REPO_ROOT,
+                                env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding="utf-8", errors="replace")
+        # The protocol log can be large, so it is counted line by line rather than kept
+        round_trips = 0
+        errors = deque(maxlen=20)
+        for line in proc.stderr:
+            if PROTOCOL_SEND in line: round_trips += 1
+            elif "pw:" not in line: errors.append(line)
+        output = proc.stdout.read()
+        if proc.wait() != 0 or not output.strip():
+            raise RuntimeError(f"benchmark run failed (size={size}, workers={workers}):\n{''.join(errors)}")
+        result = json.loads(output.strip().splitlines()[-1])
+        result.update({
+            'size': size,
+            'workers': workers,
+            'restaurants': len(urls),
+            'round_trips': round_trips,
+            'http_pages': server.stats['pages'],
+            'http_images': server.stats['images'],
+        })
+        return result
+
+def print_table(results, baseline=None):
+    base = {(r['size'], r['workers']): r for r in (baseline or [])}
+    # RSS: peak of the Python process / of the largest finished child (driver or browser)
+    print(f"{'size':<8}{'workers':>8}{'items':>8}{'wall s':>9}{'items/s':>9}{'RSS MB':>13}{'trips':>8}{'pages':>7}"
+          + ("  vs baseline" if baseline else ""))
+    for r in results:
+        rss = f"{r['peak_rss_mb'] or 0:.0f}/{r['peak_rss_children_mb'] or 0:.0f}"
+        line = (f"{r['size']:<8}{r['workers']:>8}{r['items']:>8}{r['wall_s']:>9.1f}{r['items_per_sec']:>9.1f}"
+                f"{rss:>13}{r['round_trips']:>8}{r['http_pages']:>7}")
+        old = base.get((r['size'], r['workers']))
+        if old and old['wall_s']:
+            line += f"  wall {100 * (r['wall_s'] - old['wall_s']) / old['wall_s']:+.0f}%, trips {r['round_trips'] - old['round_trips']:+d}"
+        print(line)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="benchmarks.run", description="Benchmark the scrapers against local fixture sites.")
+    parser.add_argument("--sizes", default="small,medium", help=f"Comma-separated fixture sizes: {', '.join(FIXTURE_SIZES)}")
+    parser.add_argument("--workers", default="1,4", help="Comma-separated concurrency levels")
+    parser.add_argument("--restaurants", type=int, default=4, help="Restaurants per platform")
+    parser.add_argument("--platforms", default="oddmenu,finedine", type=lambda v: v.split(","))
+    parser.add_argument("--latency-ms", type=int, default=20, help="Artificial latency per HTTP response")
+    parser.add_argument("--lazy-batch", type=int, default=10, help="Dishes rendered before scrolling (0 = all)")
+    parser.add_argument("--image-bytes", type=int, default=40000)
+    parser.add_argument("--fast-path", action="store_true", help="Embed menu JSON and let the fast path read it")
+    parser.add_argument("--compare", metavar="COMMIT", help="Show differences against results saved for COMMIT")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.child:
+        run_child(json.loads(args.child))
+        return 0
+
+    commit = git_commit()
+    results = []
+    for size in args.sizes.split(","):
+        for workers in (int(w) for w in args.workers.split(",")):
+            print(f"Running {size} x {workers} workers...", flush=True)
+            results.append(run_case(size, workers, args))
+
+    baseline = None
+    if args.compare:
+        with open(os.path.join(RESULTS_DIR, f"{args.compare}.json"), encoding="utf-8") as f:
+            baseline = json.load(f)['results']
+    print_table(results, baseline)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{commit}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            'commit': commit,
+            'date': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'options': {k: v for k, v in vars(args).items() if k not in ("child", "compare")},
+            'results': results,
+        }, f, indent=1)
+    print(f"Saved {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,367 +1,23 @@
+import os
 import streamlit as st
 import pandas as pd
-import os
-import re
-import time
-import requests
-import shutil
-import sys
-import asyncio
-import subprocess
-from playwright.sync_api import sync_playwright
-
-# --- 1. SETUP FOR DEPLOYMENT & WINDOWS ---
-# This ensures it runs on both your local Windows machine AND Streamlit Cloud
-if sys.platform == 'win32':
-    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-else:
-    # Auto-install browsers if running on Linux (Streamlit Cloud)
-    # This prevents the "Executable not found" error on the cloud
-    if os.system("playwright install chromium") != 0:
-        subprocess.run(["playwright", "install", "chromium"])
-
-# --- CONFIG ---
-STAGING_DIR = "Digital Menus"
-
-# --- UTILITY FUNCTIONS ---
-def clean_filename(text):
-    if not text: return "unknown"
-    return re.sub(r'[\\/*?:"<>|]', "", str(text)).strip()
-
-def download_image(img_url, save_path):
-    if not img_url: return
-    try:
-        response = requests.get(img_url, timeout=10)
-        if response.status_code == 200:
-            with open(save_path, 'wb') as f:
-                f.write(response.content)
-    except Exception:
-        pass
-
-def zip_folder(folder_path, zip_name):
-    shutil.make_archive(zip_name, 'zip', folder_path)
-    return f"{zip_name}.zip"
-
-def save_individual_csv(data_list, folder_path, restaurant_name, platform):
-    if not data_list: return
-
-    df = pd.DataFrame(data_list)  
-    export_df = pd.DataFrame()
-    export_df['Type'] = ["Product"] * len(df)
-    export_df['Category'] = df['Category']
-    export_df['Name (EN)'] = df['Dish']
-    export_df['Name (AR)'] = ""  
-    export_df['Description (EN)'] = df['Description']
-    export_df['Description (AR)'] = ""  
-    export_df['Price'] = df['Price']
-    export_df['Currency'] = df['Currency']
-    export_df['Status'] = ["Enabled"] * len(df)
-    export_df['Image URL'] = df['Image URL']
-
-    safe_name = clean_filename(restaurant_name)
-    # Filename format: RestaurantName_Platform.csv
-    filename = f"{safe_name}_{platform}.csv"
-    save_path = os.path.join(folder_path, filename)
-
-    export_df.to_csv(save_path, index=False, encoding='utf-8-sig')
-    return filename
-
-# --- SCRAPER: ODDMENU ---
-def run_scrape_oddmenu(url, progress_callback, image_root):
-    data = []
-    with sync_playwright() as p:
-        # UPDATED: Removed hardcoded Windows path for Cloud compatibility
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        )
-        page = context.new_page()
-
-        try:
-            progress_callback(f"Accessing {url}...")
-            page.goto(url, timeout=60000)
-            try:
-                page.wait_for_selector('.menu-list__item', timeout=15000)
-            except:
-                progress_callback(f"Could not load menu items for {url}")
-                return data
-
-            try:
-                restaurant_name = page.title().split('|')[0].strip()
-            except:
-                restaurant_name = url.split('/')[-1]
-            
-            clean_rest_name = clean_filename(restaurant_name)
-            
-            tabs = page.locator('.menu-list__item .menu__button')
-            tab_count = tabs.count()
-            
-            for t_idx in range(tab_count):
-                tabs = page.locator('.menu-list__item .menu__button')
-                current_tab = tabs.nth(t_idx)
-                tab_name = current_tab.inner_text().strip()
-                
-                progress_callback(f"--> Processing Tab: {tab_name}")
-                current_tab.click()
-                time.sleep(2)
-                
-                category_links = []
-                cat_items = page.locator('.category-item')
-                for i in range(cat_items.count()):
-                    link = cat_items.nth(i).locator('a')
-                    title = cat_items.nth(i).locator('h2')
-                    if link.count() > 0:
-                        href = link.get_attribute('href')
-                        c_name = title.inner_text().strip() if title.count() > 0 else "Unknown"
-                        if href and href.startswith('/'): href = "https://oddmenu.com" + href
-                        category_links.append({'name': c_name, 'href': href})
-                
-                for cat in category_links:
-                    cat_name = cat['name']
-                    
-                    page.goto(cat['href'], timeout=60000)
-                    try:
-                        page.wait_for_load_state("networkidle", timeout=5000)
-                        page.wait_for_selector('.menu-item', state="attached", timeout=5000)
-                    except:
-                        continue 
-
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    time.sleep(1)
-                    page.evaluate("window.scrollTo(0, 0)")
-
-                    dishes = page.locator('.menu-item')
-                    item_count = dishes.count()
-                    
-                    progress_callback(f"----> Category: {cat_name} // {item_count} Items")
-                    
-                    for d_idx in range(item_count):
-                        dish = dishes.nth(d_idx)
-                        
-                        d_name = dish.locator('.menu-item-title span').first.inner_text().strip()
-                        
-                        d_desc = ""
-                        desc_loc = dish.locator('.menu-item-description p')
-                        if desc_loc.count() > 0:
-                            d_desc = " ".join(desc_loc.all_inner_texts()).strip()
-                        
-                        d_price = "0"
-                        if dish.locator('.menu-item-price__current b').count() > 0:
-                            d_price = dish.locator('.menu-item-price__current b').first.inner_text().strip()
-                            
-                        d_currency = ""
-                        curr_loc = dish.locator('.menu-item-price__current span')
-                        if curr_loc.count() > 0:
-                            d_currency = curr_loc.first.inner_text().replace(d_price, "").strip()
-
-                        d_img_link = ""
-                        img_loc = dish.locator('.menu-item-image__preview-image-link img').first
-                        if img_loc.count() > 0:
-                            d_img_link = img_loc.get_attribute('src')
-                            if not d_img_link: d_img_link = img_loc.get_attribute('data-url')
-
-                        data.append({
-                            'Restaurant': restaurant_name,
-                            'Tab': tab_name,
-                            'Category': cat_name,
-                            'Dish': d_name,
-                            'Description': d_desc,
-                            'Price': d_price,
-                            'Currency': d_currency,
-                            'Image URL': d_img_link,
-                            'Source': url,
-                            'Platform': 'OddMenu'
-                        })
-
-                        if d_img_link and image_root:
-                            folder = os.path.join(image_root, clean_rest_name, clean_filename(cat_name))
-                            os.makedirs(folder, exist_ok=True)
-                            ext = ".png" if ".png" in d_img_link else ".jpg"
-                            fname = f"{clean_filename(d_name)}_{clean_filename(d_price)}{ext}"
-                            download_image(d_img_link, os.path.join(folder, fname))
-                    
-                    page.goto(url)
-                    try:
-                        page.locator('.menu-list__item').first.wait_for()
-                    except:
-                        pass
-
-        except Exception as e:
-            progress_callback(f"Error scraping {url}: {e}")
-        
-        browser.close()
-    return data
-
-
-# --- SCRAPER: FINEDINE ---
-def run_scrape_finedine(url, progress_callback, image_root):
-    data = []
-    
-    with sync_playwright() as p:
-        # UPDATED: Removed hardcoded Windows path for Cloud compatibility
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        page = context.new_page()
-
-        try:
-            progress_callback(f"Accessing FineDine: {url}")
-            page.goto(url, timeout=60000)
+from collections import deque
 
-            try:
-                page.wait_for_selector("button[id^='food-card-link-']", timeout=15000)
-            except:
-                progress_callback("Could not find menu items.")
-                return data
+from menuscraper.config import STAGING_DIR, MAX_WORKERS, PLATFORM_CONCURRENCY, PLATFORM_BLOCK_PROFILE, FAST_PATH
+from menuscraper.engine import read_url_file, plan_jobs, prepare_output_dir, run_batch
+from menuscraper.scheduler import ADAPTERS, detect_platform
+from menuscraper.output import parquet_available
+from menuscraper.thumbnails import pillow_available
 
-            for _ in range(5): 
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(1)
-
-            restaurant_name = None
-            try:
-                title_locator = page.locator("span.text-3xl.font-bold.text-primary")
-                if title_locator.count() > 0:
-                    restaurant_name = title_locator.first.inner_text().strip()
-            except:
-                pass
-
-            if not restaurant_name:
-                page_title = page.title()
-                if "|" in page_title: restaurant_name = page_title.split("|")[0].strip()
-                elif "-" in page_title: restaurant_name = page_title.split("-")[0].strip()
-                else: restaurant_name = page_title
-
-            restaurant_name = restaurant_name.replace("Menu", "").strip()
-            if not restaurant_name: restaurant_name = "Unknown_FineDine"
-            
-            clean_rest_name = clean_filename(restaurant_name)
-            progress_callback(f"Detected Name: {restaurant_name}")
-
-            elements_data = page.evaluate("""() => {
-                let results = [];
-                document.querySelectorAll('span.text-xl.font-bold.text-center.text-primary').forEach(el => {
-                    results.push({
-                        type: 'header',
-                        text: el.innerText,
-                        y: el.getBoundingClientRect().top + window.scrollY
-                    });
-                });
-                
-                document.querySelectorAll('button[id^="food-card-link-"]').forEach(el => {
-                    let name = el.querySelector('span.text-primary.text-base.font-bold')?.innerText || 'Unknown';
-                    let priceFull = el.querySelector('span.text-highlight_color')?.innerText || 'NA';
-                    let desc = el.querySelector('span.text-primary.text-base.font-normal.line-clamp-2')?.innerText || '';
-                    let imgEl = el.querySelector('img');
-                    let finalImg = 'No Image';
-                    if (imgEl) {
-                        if (imgEl.srcset) {
-                            let parts = imgEl.srcset.split(',');
-                            let bestPart = parts[parts.length - 1].trim(); 
-                            finalImg = bestPart.split(' ')[0]; 
-                        } else {
-                            finalImg = imgEl.src;
-                        }
-                    }
-                    results.push({
-                        type: 'item',
-                        name: name,
-                        price_full: priceFull,
-                        description: desc,
-                        img: finalImg,
-                        y: el.getBoundingClientRect().top + window.scrollY
-                    });
-                });
-                return results.sort((a, b) => a.y - b.y);
-            }""")
-
-            
-            grouped_data = [] 
-            current_cat_name = "Uncategorized"
-            current_items = []
-
-            for el in elements_data:
-                if el['type'] == 'header':
-                    if current_items:
-                        grouped_data.append((current_cat_name, current_items))
-                    current_cat_name = clean_filename(el['text'])
-                    current_items = []
-                elif el['type'] == 'item':
-                    current_items.append(el)
-            
-            if current_items:
-                grouped_data.append((current_cat_name, current_items))
-
-            for cat_name, items in grouped_data:
-                progress_callback(f"--> Category: {cat_name} // {len(items)} Items")
-                
-                for el in items:
-                    dish_name = clean_filename(el['name'])
-                    desc_text = el['description'].strip()
-                    raw_price = el['price_full'].strip()
-                    image_url = el['img']
-
-                    currency = "NA"
-                    price_val = "0"
-                    
-                    if raw_price != "NA":
-                        match = re.search(r'[\d\.]+', raw_price)
-                        if match:
-                            price_val = match.group()
-                            currency = raw_price.replace(price_val, "").strip()
-                        else:
-                            price_val = raw_price
-                    
-                    if not currency: currency = "NA"
-
-                    if image_url and "http" in image_url:
-                        image_url = image_url.replace("filters:blur(125)/", "").replace("filters:blur(125)", "")
-
-                    data.append({
-                        'Restaurant': restaurant_name,
-                        'Tab': "Menu",
-                        'Category': cat_name,
-                        'Dish': dish_name,
-                        'Description': desc_text,
-                        'Price': price_val,
-                        'Currency': currency,
-                        'Image URL': image_url,
-                        'Source': url,
-                        'Platform': 'FineDine'
-                    })
-
-                    if image_url and "http" in image_url and image_root:
-                        folder = os.path.join(image_root, clean_rest_name, cat_name)
-                        os.makedirs(folder, exist_ok=True)
-                        ext = ".jpg"
-                        if ".png" in image_url: ext = ".png"
-                        price_clean = clean_filename(price_val)
-                        filename = f"{dish_name}_{price_clean}{ext}"
-                        full_path = os.path.join(folder, filename)
-                        
-                        if not os.path.exists(full_path):
-                            download_image(image_url, full_path)
-
-        except Exception as e:
-            progress_callback(f"Error scraping {url}: {e}")
-
-        browser.close()
-    
-    return data
+# The scraping engine lives in the `menuscraper` package (also usable headless via
+# `python -m menuscraper run urls.csv`); this file is only the Streamlit front end.
+PLATFORM_FILTERS = {"All Platforms": None, **{f"{name} Only": name for name in sorted(ADAPTERS)}}
+UI_TABLE_ROWS = 200   # Rows rendered per table; the full data is in the CSV/zip
 
 # MAIN STREAMLIT APP
 def main():
     st.set_page_config(page_title="Menu Scraper", page_icon="🍽️", layout="wide")
 
-    # Cleanup function
-    def cleanup_temp():
-        if os.path.exists(STAGING_DIR):
-            try:
-                shutil.rmtree(STAGING_DIR)
-            except:
-                pass
-        if os.path.exists("Digital Menus.zip"):
-            os.remove("Digital Menus.zip")
-
     st.markdown("""
     <style>
         .block-container {padding-top: 2rem;}
@@ -390,7 +46,33 @@ def main():
         
         st.divider()
         st.subheader("Filters")
-        platform_filter = st.selectbox("Select Platform", ["All Platforms", "FineDine Only", "OddMenu Only"])
+        platform_filter = st.selectbox("Select Platform", list(PLATFORM_FILTERS))
+        
+        st.divider()
+        st.subheader("Performance")
+        workers = st.slider("Restaurants in parallel", 1, 16, MAX_WORKERS)
+        platform_limits = {
+            platform: st.number_input(f"Max parallel {platform}", 1, 16, PLATFORM_CONCURRENCY.get(platform, 2))
+            for platform in sorted(ADAPTERS)
+        }
+        incremental = st.checkbox("Track menu changes and skip unchanged categories", True)
+        use_image_cache = st.checkbox("Keep a persistent image cache between runs", True)
+        use_fast_path = st.checkbox("Read embedded menu JSON before launching a browser", True)
+        block_profiles = {
+            platform: "lean" if st.checkbox(f"Block images/fonts/trackers on {platform}", PLATFORM_BLOCK_PROFILE.get(platform) == "lean") else "trackers"
+            for platform in sorted(ADAPTERS)
+        }
+        output_formats = ["csv"]
+        if st.checkbox("Also write JSON Lines", False): output_formats.append("jsonl")
+        if st.checkbox("Also write Parquet", False, disabled=not parquet_available(),
+                       help=None if parquet_available() else "Install pyarrow to enable Parquet output."):
+            output_formats.append("parquet")
+        stage_images = not st.checkbox("Keep images only inside the zip (saves disk space)", False)
+        dedupe_images = st.checkbox("Store identical images once (repeats listed in Image_duplicates.csv)", True)
+        thumbnails = "webp" if st.checkbox("Also make WebP thumbnails", False, disabled=not pillow_available(),
+                                           help=None if pillow_available() else "Install Pillow to enable thumbnails.") else None
+        resume = st.checkbox("Resume the previous run (skip restaurants already done)", False,
+                             help="Keeps the existing output folder; images are kept on disk while resuming.")
         
         st.divider()
         start_btn = st.button("🚀 Start Scraping", type="primary", use_container_width=True)
@@ -401,14 +83,10 @@ def main():
     # Priority: File > Paste
     if uploaded_file:
         try:
-            if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file, encoding="cp1252")
-            else:
-                df = pd.read_excel(uploaded_file)
-            df.columns = [c.lower() for c in df.columns]
-            if 'url' not in df.columns:
-                st.error("❌ Column 'url' missing in file.")
-                df = None
+            df = read_url_file(uploaded_file, uploaded_file.name)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            df = None
         except Exception as e:
             st.error(f"Error reading file: {e}")
             df = None
@@ -426,84 +104,145 @@ def main():
         if df is None or df.empty:
             st.error("⚠️ Please upload a file OR paste links to proceed.")
         else:
-            # 1. CLEANUP AND SETUP STAGING
-            cleanup_temp()
-            os.makedirs(STAGING_DIR)
+            # 1. CLEANUP AND SETUP STAGING (kept when resuming)
+            if resume: os.makedirs(STAGING_DIR, exist_ok=True)
+            else: prepare_output_dir(STAGING_DIR)
 
             progress_bar = st.progress(0)
-            all_results = []
             
             total_urls = len(df)
-            finedine_count = df['url'].apply(lambda x: 1 if "finedine" in str(x).lower() else 0).sum()
-            oddmenu_count = df['url'].apply(lambda x: 1 if "oddmenu" in str(x).lower() else 0).sum()
+            platform_counts = df['url'].apply(lambda x: detect_platform(str(x))).value_counts()
 
-            col1, col2, col3 = st.columns(3)
-            col1.metric("Total Restaurants", total_urls)
-            col2.metric("FineDine Links", finedine_count)
-            col3.metric("OddMenu Links", oddmenu_count)
+            cols = st.columns(1 + len(ADAPTERS))
+            cols[0].metric("Total Restaurants", total_urls)
+            for col, platform in zip(cols[1:], sorted(ADAPTERS)):
+                col.metric(f"{platform} Links", int(platform_counts.get(platform, 0)))
             
-            for index, row in df.iterrows():
-                url = str(row['url']).strip()
-                is_finedine = "finedine" in url.lower()
-                is_oddmenu = "oddmenu" in url.lower()
-                
-                if platform_filter == "FineDine Only" and not is_finedine: continue
-                if platform_filter == "OddMenu Only" and not is_oddmenu: continue
-
-                st.subheader(f"🥣 Processing Restaurant {index + 1}/{total_urls}")
+            jobs = plan_jobs(df, PLATFORM_FILTERS[platform_filter])
+
+            # Restaurants finish out of order; each gets its panel when it completes
+            live_ph = st.empty()
+            logs = {}
+            running = {}
+            recent_rows = deque(maxlen=UI_TABLE_ROWS)
+            finished = 0
+            summary = None
+            for event in run_batch(
+                jobs,
+                out_dir=STAGING_DIR,
+                workers=workers,
+                platform_limits=platform_limits,
+                block_profiles=block_profiles,
+                fast_path={p: use_fast_path and FAST_PATH[p] for p in FAST_PATH},
+                use_image_cache=use_image_cache,
+                incremental=incremental,
+                output_formats=output_formats,
+                stage_images=stage_images or resume,
+                resume=resume,
+                dedupe_images=dedupe_images,
+                thumbnails=thumbnails,
+            ):
+                kind = event[0]
+                if kind == 'resumed':
+                    finished += event[1]
+                    st.info(f"↩️ Resuming: {event[1]} restaurants were already done in the previous run")
+                    continue
+                if kind == 'log':
+                    index, url, msg = event[1], event[2], event[3]
+                    logs.setdefault(index, []).append(msg)
+                    running[index] = f"⏳ {url} — {msg}"
+                    live_ph.info("\n\n".join(running.values()))
+                    continue
+                if kind == 'packaging':
+                    live_ph.info("⏳ Finishing image downloads and the zip archive...")
+                    continue
+                if kind == 'finished':
+                    live_ph.empty()
+                    summary = event[1]
+                    continue
+
+                _, index, url, platform, restaurant_data, changes, saved_filename = event
+                running.pop(index, None)
+                if running: live_ph.info("\n\n".join(running.values()))
+                else: live_ph.empty()
+                finished += 1
+                recent_rows.extend(restaurant_data)
+
+                st.subheader(f"🥣 Restaurant {index + 1}/{total_urls} ({finished}/{len(jobs)} finished)")
                 
                 col_status, col_table = st.columns([1, 2])
                 
                 with col_status:
                     with st.status(f"Scanning {url}...", expanded=True) as status:
                         live_table_ph = col_table.empty()
-                        restaurant_data = []
-                        
-                        platform_name = "Unknown"
-                        if is_finedine:
-                            platform_name = "FineDine"
-                            restaurant_data = run_scrape_finedine(url, status.write, STAGING_DIR)
-                        elif is_oddmenu:
-                            platform_name = "OddMenu"
-                            restaurant_data = run_scrape_oddmenu(url, status.write, STAGING_DIR)
-                        else:
-                            status.warning("Unknown Platform URL")
-                        
-                        all_results.extend(restaurant_data)
+                        for msg in logs.pop(index, []):
+                            status.write(msg)
                         
                         if restaurant_data:
-                            live_table_ph.dataframe(pd.DataFrame(restaurant_data))
-                            
-                            # --- GENERATE INDIVIDUAL CSV ---
-                            r_name = restaurant_data[0]['Restaurant']
-                            
-                            # Save to STAGING_DIR (Using correct naming convention)
-                            saved_filename = save_individual_csv(restaurant_data, STAGING_DIR, r_name, platform_name)
-                            
+                            live_table_ph.dataframe(pd.DataFrame(restaurant_data[:UI_TABLE_ROWS]))
+                            if len(restaurant_data) > UI_TABLE_ROWS:
+                                status.write(f"Showing {UI_TABLE_ROWS} of {len(restaurant_data)} items")
                             status.write(f"💾 CSV Created: {saved_filename}")
                             status.update(label="✅ Scraping Complete!", state="complete", expanded=False)
                         else:
                             status.update(label="❌ Failed or Empty", state="error", expanded=False)
 
-                progress_bar.progress((index + 1) / total_urls)
+                progress_bar.progress(finished / len(jobs))
                 st.divider()
 
+            img_stats = summary['images']
+            st.caption(f"🖼️ Images: {img_stats['downloaded']} downloaded, {img_stats['failed']} failed, "
+                       f"{img_stats['retries']} retries, {img_stats['bytes'] / 1_048_576:.1f} MB"
+                       + (f", {img_stats['duplicates']} duplicates stored once ({img_stats['bytes_deduped'] / 1_048_576:.1f} MB saved)"
+                          if img_stats['duplicates'] else ""))
+            if summary['thumbnails']:
+                thumb_stats = summary['thumbnails']
+                st.caption(f"🔍 Thumbnails: {thumb_stats['made']} made, {thumb_stats['failed']} failed, "
+                           f"{thumb_stats['bytes'] / 1_048_576:.1f} MB")
+            if summary['cache']:
+                cache_stats = summary['cache']
+                st.caption(f"🗄️ Image cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                           f"{cache_stats['bytes_saved'] / 1_048_576:.1f} MB not re-downloaded, "
+                           f"{cache_stats['evicted']} evicted ({summary['cache_bytes'] / 1_048_576:.0f} MB cached)")
+            block_stats = summary['blocked']
+            blocked_types = ", ".join(f"{k}: {v}" for k, v in sorted(block_stats['by_type'].items()))
+            st.caption(f"🚫 Blocked {block_stats['blocked']} browser requests (≈{block_stats['bytes_saved'] / 1_048_576:.1f} MB saved)"
+                       + (f" — {blocked_types}" if blocked_types else ""))
+            policy_stats = summary['policy']
+            st.caption(f"🚦 Requests: {policy_stats['retries']} retries, {policy_stats['short_circuited']} short-circuited "
+                       f"({policy_stats['breaker_opened']} hosts paused), {policy_stats['throttled_s']:.1f}s throttled")
+            if summary['issues']:
+                with st.expander(f"⚠️ {len(summary['issues'])} issues (retried, skipped or stale)"):
+                    st.dataframe(pd.DataFrame(summary['issues'][:UI_TABLE_ROWS]), hide_index=True)
+                    st.caption(f"Full list: {summary['issues_csv']}")
+
+            timings = summary['timings']
+            with st.expander("⏱️ Performance report"):
+                col1, col2, col3, col4 = st.columns(4)
+                col1.metric("Wall time", f"{timings['wall_s']:.1f} s")
+                col2.metric("Items / sec", timings['items_per_sec'])
+                col3.metric("Image data", f"{timings['image_bytes'] / 1_048_576:.1f} MB")
+                col4.metric("Retries", timings['retries'])
+                st.markdown("**Stages** (p50/p95 per span)")
+                st.dataframe(pd.DataFrame(timings['stages']), hide_index=True)
+                st.markdown("**Slowest restaurants**")
+                st.dataframe(pd.DataFrame(timings['restaurants'][:UI_TABLE_ROWS]), hide_index=True)
+                st.caption("Full span data: " + ", ".join(summary['timing_files']))
+
+            job_counts = summary['jobs']
+            st.caption(f"🧾 Restaurants: {job_counts['done']} done, {job_counts['failed']} failed — tick 'Resume' to retry the failed ones")
             st.success("🎉 Batch Processing Finished!")
             
-            if all_results:
-                final_df = pd.DataFrame(all_results)
-                
-                # 2. SAVE MASTER CSV
-                csv_path = os.path.join(STAGING_DIR, "All_menus_in_one.csv")
-                final_df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-                
+            if summary['rows']:
                 st.markdown("### 📊 Final Summary")
-                st.dataframe(final_df)
+                st.caption(f"{summary['rows']} rows written to {', '.join(summary['outputs'].values())} — last {len(recent_rows)} shown")
+                st.dataframe(pd.DataFrame(list(recent_rows)))
                 
-                # 3. ZIP EVERYTHING
-                zip_file = zip_folder(STAGING_DIR, "Digital Menus")
+                if summary['changes']:
+                    st.markdown("### 🔁 Menu Changes Since Last Run")
+                    st.dataframe(pd.DataFrame(summary['changes']))
                 
-                with open(zip_file, "rb") as fp:
+                with open(summary['zip'], "rb") as fp:
                     st.download_button(
                         label="📥 Download All Data (Zip)",
                         data=fp,
@@ -516,4 +255,4 @@ def main():
                 st.warning("No data was extracted from any URL.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,6 @@
+from .engine import read_url_file, plan_jobs, prepare_output_dir, run_batch
+from .scheduler import detect_platform, scrape_restaurant, scrape_batch
+from .platforms import ADAPTERS, PlatformAdapter, register, adapter_for
+from .crawler import crawl
+from .oddmenu import run_scrape_oddmenu
+from .finedine import run_scrape_finedine
@@ -0,0 +1,217 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+import subprocess
+import importlib.metadata
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from playwright.sync_api import sync_playwright
+
+from .config import CACHE_ROOT, BROWSER_POOL_SIZE, BROWSER_MAX_USES, PLATFORM_BLOCK_PROFILE
+from .timing import span
+
+# --- 1. SETUP FOR DEPLOYMENT & WINDOWS ---
+# This ensures it runs on both your local Windows machine AND Streamlit Cloud
+if sys.platform == 'win32':
+    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+
+# Auto-install browsers if running on Linux (Streamlit Cloud). This used to run on
+# every import (i.e. every Streamlit rerun); now it runs the first time a browser is
+# actually launched and is remembered per Playwright version in a marker file.
+_BROWSER_MARKER = os.path.join(CACHE_ROOT, "chromium-installed")
+_install_lock = threading.Lock()
+_browser_ready = False
+
+def ensure_browser_installed():
+    global _browser_ready
+    if _browser_ready or sys.platform == 'win32': return
+    with _install_lock:
+        if _browser_ready: return
+        try:
+            version = importlib.metadata.version("playwright")
+        except importlib.metadata.PackageNotFoundError:
+            version = "unknown"
+        try:
+            with open(_BROWSER_MARKER) as f:
+                _browser_ready = f.read().strip() == version
+        except OSError:
+            pass
+        if not _browser_ready:
+            # This prevents the "Executable not found" error on the cloud
+            if subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"]).returncode == 0:
+                os.makedirs(CACHE_ROOT, exist_ok=True)
+                with open(_BROWSER_MARKER, "w") as f:
+                    f.write(version)
+            _browser_ready = True
+
+# --- RESOURCE BLOCKING ---
+# We only need the DOM and the image URLs, so images, fonts, media and trackers are
+# aborted at the context level. XHR/fetch calls that populate the menu always pass.
+ANALYTICS_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "facebook.net", "facebook.com", "hotjar.com", "clarity.ms", "segment.io", "mixpanel.com",
+    "amplitude.com", "tiktok.com", "snapchat.com", "intercom.io",
+)
+
+BLOCK_PROFILES = {
+    "off": None,
+    "trackers": {'types': set(), 'hosts': ANALYTICS_HOSTS},
+    "lean": {'types': {"image", "font", "media"}, 'hosts': ANALYTICS_HOSTS},
+}
+
+# Aborted requests never report a size, so savings are estimated per resource type
+ESTIMATED_BLOCKED_BYTES = {"image": 80_000, "font": 40_000, "media": 500_000, "script": 60_000}
+
+class ResourceBlocker:
+    def __init__(self, platform_profiles=None):
+        self.platform_profiles = dict(PLATFORM_BLOCK_PROFILE if platform_profiles is None else platform_profiles)
+        self.stats = {'blocked': 0, 'bytes_saved': 0, 'by_type': {}}
+        self._lock = threading.Lock()
+
+    def attach(self, context, platform):
+        profile = BLOCK_PROFILES.get(self.platform_profiles.get(platform, "off"))
+        if not profile: return
+
+        def handle(route):
+            request = route.request
+            host = urlparse(request.url).hostname or ""
+            if request.resource_type in profile['types'] or any(host == h or host.endswith("." + h) for h in profile['hosts']):
+                self._record(request.resource_type)
+                route.abort()
+            else:
+                route.continue_()
+
+        context.route("**/*", handle)
+
+    def _record(self, resource_type):
+        with self._lock:
+            self.stats['blocked'] += 1
+            self.stats['bytes_saved'] += ESTIMATED_BLOCKED_BYTES.get(resource_type, 20_000)
+            self.stats['by_type'][resource_type] = self.stats['by_type'].get(resource_type, 0) + 1
+
+
+# --- BROWSER POOL ---
+# Launching Chromium costs seconds, so the batch keeps a few browsers warm and
+# hands out a fresh, isolated context per restaurant. A browser is relaunched
+# after serving `max_uses` contexts, or as soon as it (or one of its pages) crashes.
+class BrowserPool:
+    def __init__(self, size=BROWSER_POOL_SIZE, max_uses=BROWSER_MAX_USES, headless=True, blocker=None):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.headless = headless
+        self.blocker = blocker
+        self._playwright = None
+        self._slots = []
+        self._next = 0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        if self._playwright is None:
+            ensure_browser_installed()
+            with span("launch"):
+                self._playwright = sync_playwright().start()
+            try:
+                for _ in range(self.size): self._slots.append({'browser': self._launch(), 'uses': 0})
+            except Exception:
+                # Leave nothing half-started, so the next start() tries again from scratch
+                self.close()
+                raise
+        return self
+
+    def close(self):
+        for slot in self._slots:
+            try:
+                slot['browser'].close()
+            except Exception:
+                pass
+        self._slots = []
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def _launch(self):
+        # UPDATED: Removed hardcoded Windows path for Cloud compatibility
+        with span("launch"):
+            return self._playwright.chromium.launch(headless=self.headless)
+
+    def _recycle(self, slot):
+        try:
+            slot['browser'].close()
+        except Exception:
+            pass
+        slot['browser'] = self._launch()
+        slot['uses'] = 0
+
+    @contextmanager
+    def context(self, platform=None, **options):
+        self.start()
+        slot = self._slots[self._next]
+        self._next = (self._next + 1) % len(self._slots)
+
+        if slot['uses'] >= self.max_uses or not slot['browser'].is_connected():
+            self._recycle(slot)
+        slot['uses'] += 1
+
+        crashed = []
+        context = slot['browser'].new_context(**options)
+        context.on("page", lambda page: page.on("crash", lambda _: crashed.append(True)))
+        if self.blocker: self.blocker.attach(context, platform)
+        try:
+            yield context
+        except Exception:
+            crashed.append(True)
+            raise
+        finally:
+            try:
+                context.close()
+            except Exception:
+                crashed.append(True)
+            if crashed or not slot['browser'].is_connected():
+                self._recycle(slot)
+
+
+@contextmanager
+def borrow_context(pool, platform=None, **options):
+    # Scrapers called on their own (without a batch pool) get a single-use pool.
+    if pool is not None:
+        with pool.context(platform, **options) as context:
+            yield context
+        return
+    with BrowserPool(size=1, blocker=ResourceBlocker()) as own_pool:
+        with own_pool.context(platform, **options) as context:
+            yield context
+
+
+# --- PAGE LOADS ---
+# Navigations go through the RequestPolicy (rate limit, circuit breaker, adaptive
+# timeout). A page whose items never appear is reloaded with backoff instead of being
+# dropped, and whatever is finally given up on is recorded as an issue.
+def goto(page, url, policy, kind="page", default_timeout_ms=60000, **options):
+    with span("navigate"), policy.request(url, kind, default_timeout_ms) as timeout_ms:
+        return page.goto(url, timeout=timeout_ms, **options)
+
+def wait_for_items(page, url, selector, policy, restaurant, target, timeout_ms=15000, state="visible", wait_until="load"):
+    # Returns True once `selector` is on the page (reloading up to policy.retries times)
+    for attempt in range(policy.retries + 1):
+        try:
+            with span("wait"):
+                page.wait_for_selector(selector, state=state, timeout=timeout_ms)
+            if attempt: policy.note(restaurant, 'retried', 'wait', target, f"items appeared after {attempt} reload(s)")
+            return True
+        except Exception as e:
+            if attempt == policy.retries:
+                policy.note(restaurant, 'skipped', 'wait', target, f"no '{selector}' after {attempt + 1} attempts: {e}".splitlines()[0])
+                return False
+            time.sleep(policy.backoff(attempt))
+            try:
+                goto(page, url, policy, kind=wait_until, wait_until=wait_until)
+            except Exception:
+                pass
+    return False
@@ -0,0 +1,155 @@
+import os
+import sys
+import argparse
+
+from .config import STAGING_DIR, MAX_WORKERS, PLATFORM_CONCURRENCY, PLATFORM_BLOCK_PROFILE, FAST_PATH
+from .browser import ensure_browser_installed
+from .output import OUTPUT_FORMATS, parquet_available
+from .thumbnails import THUMBNAIL_FORMATS, check_thumbnail_format
+from .engine import PLATFORM_FILTERS, read_url_file, plan_jobs, prepare_output_dir, run_batch
+
+# --- COMMAND LINE ---
+# python -m menuscraper run urls.csv --workers 8 --out "Digital Menus"
+def build_parser():
+    parser = argparse.ArgumentParser(prog="menuscraper", description="Scrape FineDine and OddMenu digital menus in batch.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Scrape every URL in a CSV/Excel file or a text file (one URL per line)")
+    run.add_argument("urls", help="CSV/XLSX with a 'url' column, or a .txt file")
+    run.add_argument("--out", default=STAGING_DIR, help=f"Output folder (default: {STAGING_DIR!r})")
+    run.add_argument("--overwrite", action="store_true", help="Clear the output folder if it is not empty")
+    run.add_argument("--resume", action="store_true",
+                     help="Continue an interrupted run in the same output folder, skipping finished restaurants")
+    run.add_argument("--workers", type=int, default=MAX_WORKERS, help="Restaurants scraped at the same time")
+    run.add_argument("--platform", choices=sorted(PLATFORM_FILTERS), default="all")
+    run.add_argument("--max-per-platform", action="append", default=[], metavar="PLATFORM=N",
+                     help="Concurrency cap for one platform, e.g. OddMenu=2 (repeatable)")
+    run.add_argument("--no-fast-path", action="store_true", help="Always use the browser")
+    run.add_argument("--no-block", action="store_true", help="Let pages load images and fonts (trackers stay blocked)")
+    run.add_argument("--no-image-cache", action="store_true", help="Do not use the persistent image cache")
+    run.add_argument("--no-incremental", action="store_true", help="Do not track menu changes between runs")
+    run.add_argument("--no-zip", action="store_true", help="Skip building the zip archive")
+    run.add_argument("--images-in-zip-only", action="store_true",
+                     help="Write images straight into the zip instead of the output folder")
+    run.add_argument("--format", action="append", default=[], choices=OUTPUT_FORMATS[1:], dest="formats",
+                     help="Also stream the combined rows as JSON Lines or Parquet (repeatable)")
+    run.add_argument("--thumbnails", choices=sorted(THUMBNAIL_FORMATS), help="Also write a resized copy of every image (needs Pillow)")
+    run.add_argument("--keep-duplicate-images", action="store_true",
+                     help="Store every copy of an image that appears more than once (default: store it once)")
+
+    commands.add_parser("install-browsers", help="Install Chromium for Playwright if it is missing")
+    return parser
+
+def parse_platform_limits(values):
+    limits = dict(PLATFORM_CONCURRENCY)
+    names = {name: platform for name, platform in PLATFORM_FILTERS.items() if platform}
+    for value in values:
+        name, _, count = value.partition("=")
+        if name.lower() not in names or not count.isdigit():
+            raise ValueError(f"Invalid --max-per-platform value: {value!r}")
+        limits[names[name.lower()]] = int(count)
+    return limits
+
+def run_command(args):
+    try:
+        with open(args.urls, "rb") as f:
+            df = read_url_file(f, args.urls.lower())
+        platform_limits = parse_platform_limits(args.max_per_platform)
+        if "parquet" in args.formats and not parquet_available():
+            raise ValueError("--format parquet needs pyarrow or fastparquet installed")
+        if args.thumbnails: check_thumbnail_format(args.thumbnails)
+        if args.images_in_zip_only and args.no_zip:
+            raise ValueError("--images-in-zip-only cannot be combined with --no-zip")
+        if args.resume and (args.overwrite or args.images_in_zip_only):
+            raise ValueError("--resume cannot be combined with --overwrite or --images-in-zip-only")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if args.resume:
+        os.makedirs(args.out, exist_ok=True)
+    elif os.path.isdir(args.out) and os.listdir(args.out) and not args.overwrite:
+        print(f"Error: {args.out!r} is not empty (use --overwrite to clear it, or --resume to continue)", file=sys.stderr)
+        return 2
+    else:
+        prepare_output_dir(args.out)
+
+    jobs = plan_jobs(df, PLATFORM_FILTERS[args.platform])
+    print(f"{len(jobs)} restaurants to scrape ({len(df)} URLs in {args.urls})")
+    finished = 0
+    summary = None
+    for event in run_batch(
+        jobs,
+        out_dir=args.out,
+        workers=args.workers,
+        platform_limits=platform_limits,
+        block_profiles={p: "trackers" if args.no_block else PLATFORM_BLOCK_PROFILE.get(p, "lean") for p in PLATFORM_FILTERS.values() if p},
+        fast_path={p: FAST_PATH[p] and not args.no_fast_path for p in FAST_PATH},
+        use_image_cache=not args.no_image_cache,
+        incremental=not args.no_incremental,
+        make_zip=not args.no_zip,
+        output_formats=["csv"] + args.formats,
+        stage_images=not args.images_in_zip_only,
+        resume=args.resume,
+        dedupe_images=not args.keep_duplicate_images,
+        thumbnails=args.thumbnails,
+    ):
+        kind = event[0]
+        if kind == 'resumed':
+            finished += event[1]
+            print(f"Resuming: {event[1]} restaurants already done")
+        elif kind == 'log':
+            print(f"[{event[1] + 1}] {event[3]}")
+        elif kind == 'restaurant':
+            _, index, url, platform, data, changes, csv_filename = event
+            finished += 1
+            outcome = f"{len(data)} items -> {csv_filename}" if data else "failed or empty"
+            print(f"[{index + 1}] {'OK' if data else 'FAILED'} {url}: {outcome} ({finished}/{len(jobs)})")
+        elif kind == 'packaging':
+            print("Finishing image downloads and writing output...")
+        else:
+            summary = event[1]
+
+    counts = summary['jobs']
+    print(f"Restaurants: {counts['done']} done, {counts['failed']} failed (progress in {summary['manifest']})")
+    timings = summary['timings']
+    print(f"Throughput: {timings['items']} items in {timings['wall_s']:.1f}s ({timings['items_per_sec']} items/s)")
+    for stage in timings['stages']:
+        print(f"  {stage['Stage']:<9} {stage['Count']:>6} spans  total {stage['Total s']:>8.1f}s  "
+              f"p50 {stage['p50 ms']:>8.0f}ms  p95 {stage['p95 ms']:>8.0f}ms  retries {stage['Retries']}")
+    if summary['timing_files']:
+        print(f"Timings: {', '.join(summary['timing_files'])}")
+    img = summary['images']
+    print(f"Images: {img['downloaded']} downloaded, {img['failed']} failed, {img['retries']} retries, "
+          f"{img['bytes'] / 1_048_576:.1f} MB")
+    if img['duplicates']:
+        print(f"Duplicate images: {img['duplicates']} stored once ({img['bytes_deduped'] / 1_048_576:.1f} MB saved) "
+              f"-> {summary['duplicates_csv']}")
+    if summary['thumbnails']:
+        thumbs = summary['thumbnails']
+        print(f"Thumbnails: {thumbs['made']} made, {thumbs['failed']} failed, {thumbs['bytes'] / 1_048_576:.1f} MB")
+    if summary['cache']:
+        print(f"Image cache: {summary['cache']['hits']} hits, {summary['cache']['misses']} misses")
+    if summary['changes_csv']:
+        print(f"Menu changes: {len(summary['changes'])} -> {summary['changes_csv']}")
+    policy = summary['policy']
+    print(f"Requests: {policy['retries']} retries, {policy['short_circuited']} short-circuited "
+          f"({policy['breaker_opened']} hosts paused), {policy['throttled_s']:.1f}s throttled")
+    if summary['issues_csv']:
+        print(f"Issues: {len(summary['issues'])} retried/skipped/stale -> {summary['issues_csv']}")
+    if not summary['rows']:
+        print("No data was extracted from any URL.", file=sys.stderr)
+        return 1
+    print(f"Master CSV: {summary['master_csv']} ({summary['rows']} rows)")
+    for fmt, path in summary['outputs'].items():
+        if fmt != "csv": print(f"{fmt.upper()}: {path}")
+    if summary['zip']:
+        print(f"Archive: {summary['zip']}")
+    return 0
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "install-browsers":
+        ensure_browser_installed()
+        return 0
+    return run_command(args)
@@ -0,0 +1,92 @@
+import os
+
+# --- CONFIG ---
+STAGING_DIR = "Digital Menus"
+CACHE_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "digital-menu-scraper")  # Kept between runs
+BROWSER_POOL_SIZE = 1          # Warm Chromium processes kept alive for the whole batch
+BROWSER_MAX_USES = 25          # Contexts served by one browser before it is relaunched
+MAX_WORKERS = 4               # Restaurants scraped at the same time
+PLATFORM_CONCURRENCY = {       # Per-host caps so one platform is never hammered
+    "OddMenu": 2,
+    "FineDine": 2,
+}
+IMAGE_WORKERS = 8              # Threads draining the image download queue
+IMAGE_PER_HOST = 4             # Simultaneous connections to a single image host
+IMAGE_RETRIES = 3              # Extra attempts for timeouts, 429s and 5xx responses
+PAGE_RETRIES = 2               # Extra reloads for a page whose menu items never appear
+RETRY_BACKOFF = 0.5            # Seconds; the backoff ceiling doubles per attempt (full jitter)
+RETRY_BACKOFF_MAX = 20         # Seconds; cap on a single backoff
+HOST_RATE = 25                 # Requests per second to one host (token bucket)...
+HOST_BURST = 50                # ...with this much burst
+IMAGE_HOST_RATE = 200          # Image fetches have their own bucket (IMAGE_PER_HOST also caps them)
+BREAKER_FAILURES = 8           # Consecutive failures before a host is paused
+BREAKER_COOLDOWN = 30          # Seconds a paused host is left alone before one trial request
+TIMEOUT_FACTOR = 4             # Adaptive timeout = p95 latency for the host x this factor...
+MIN_TIMEOUT_MS = 5000          # ...but never below this, nor above the call's default
+THUMBNAIL_SIZE = 320           # Longest side of a thumbnail, in pixels
+THUMBNAIL_QUALITY = 80         # JPEG/WebP encoder quality for thumbnails
+THUMBNAIL_WORKERS = 2          # Threads resizing images (Pillow releases the GIL while it works)
+IMAGE_CACHE_DIR = os.path.join(CACHE_ROOT, "images")
+IMAGE_CACHE_MAX_BYTES = 2 * 1024 ** 3   # Least recently used images are evicted past this
+STATE_DB = os.path.join(CACHE_ROOT, "state.db")
+ODDMENU_CATEGORY_PAGES = 3     # OddMenu category pages loading at the same time per restaurant
+READY_BUDGET_MS = 20000        # Max time spent scrolling a page for lazy-loaded items
+READY_TAB_BUDGET_MS = 5000     # Max time waiting for a tab switch to re-render
+READY_SETTLE_MS = 250          # DOM must stay quiet this long to count as loaded
+PLATFORM_BLOCK_PROFILE = {     # Resource-blocking profile per platform (see BLOCK_PROFILES)
+    "OddMenu": "lean",
+    "FineDine": "lean",
+}
+FAST_PATH = {                  # Try reading the menu's embedded JSON before launching a browser
+    "OddMenu": True,
+    "FineDine": True,
+}
+ODDMENU_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# --- SITE CONFIGS ---
+# What the shared crawler (crawler.py) looks for on each platform; the matching
+# PlatformAdapter (platforms.py) only adds naming and record mapping.
+#   hosts          glob patterns for the menu URL's host name (registry matching)
+#   user_agent     browser user agent, when the default one is turned away
+#   ready          selector that marks the landing page as loaded
+#   title          element holding the restaurant name (else the page title is used)
+#   tabs           buttons clicked one by one, each showing a set of `sections`
+#   sections       links to pages holding part of the menu (name, href); without them the whole
+#                  menu is read off the landing page
+#   items          one dish per `item`; an optional `header` marks where a category starts
+#   section_pages  section pages loading at the same time per restaurant
+# Each field is a selector (its innerText) or a dict with: sel (omit for the element
+# itself), attr (name or list, first non-empty wins; "srcset" takes the largest
+# candidate), absolute (resolve against the page URL), all (join every match),
+# remove (drop another field's value from this one) and default (when missing or empty).
+SITES = {
+    "OddMenu": {
+        "hosts": ["oddmenu.com", "*.oddmenu.com"],
+        "user_agent": ODDMENU_USER_AGENT,
+        "ready": ".menu-list__item",
+        "tabs": ".menu-list__item .menu__button",
+        "sections": {"item": ".category-item", "fields": {
+            "name": {"sel": "h2", "default": "Unknown"},
+            "href": {"sel": "a", "attr": "href", "absolute": True},
+        }},
+        "section_pages": ODDMENU_CATEGORY_PAGES,
+        "items": {"item": ".menu-item", "fields": {
+            "name": ".menu-item-title span",
+            "description": {"sel": ".menu-item-description p", "all": True},
+            "price": {"sel": ".menu-item-price__current b", "default": "0"},
+            "currency": {"sel": ".menu-item-price__current span", "remove": "price"},
+            "img": {"sel": ".menu-item-image__preview-image-link img", "attr": ["src", "data-url"]},
+        }},
+    },
+    "FineDine": {
+        "hosts": ["finedinemenu.com", "*.finedinemenu.com", "finedine.com", "*.finedine.com"],
+        "ready": "button[id^='food-card-link-']",
+        "title": "span.text-3xl.font-bold.text-primary",
+        "items": {"item": "button[id^='food-card-link-']", "header": "span.text-xl.font-bold.text-center.text-primary", "fields": {
+            "name": {"sel": "span.text-primary.text-base.font-bold", "default": "Unknown"},
+            "price_full": {"sel": "span.text-highlight_color", "default": "NA"},
+            "description": "span.text-primary.text-base.font-normal.line-clamp-2",
+            "img": {"sel": "img", "attr": "srcset", "default": "No Image"},
+        }},
+    },
+}
@@ -0,0 +1,221 @@
+from .browser import borrow_context, goto, wait_for_items
+from .images import borrow_downloader, queue_dish_image
+from .readiness import scroll_until_stable, report_wait_savings
+from .state import fingerprint, http_fingerprint
+from .timing import span
+
+# --- SHARED CRAWLER ---
+# One browser flow serves every platform. What differs per site is declared in its
+# SITES config (config.py), and the PlatformAdapter (platforms.py) maps what was read
+# into records:
+#   1. open the landing page and wait for `ready`
+#   2. adapter.discover(): section links, or None when the menu is on the landing page
+#   3. adapter.extract(): every dish on a page in one bulk page.evaluate
+#   4. adapter.normalize(): one record per dish
+# Section pages load in parallel, sections whose embedded JSON is unchanged are reused
+# from the snapshot store, and a section that never loads falls back to its last copy.
+
+# Reads a SITES spec ({item, header?, fields}) in one round trip; see config.py for
+# the field options. With a `header`, headers and items come back in page order,
+# tagged with `type` and their scroll position `y`.
+EXTRACT_JS = """(spec) => {
+    const read = (root, field) => {
+        if (typeof field === 'string') field = {sel: field};
+        const found = !field.sel ? [root]
+            : field.all ? Array.from(root.querySelectorAll(field.sel))
+            : [root.querySelector(field.sel)].filter(el => el);
+        const values = found.map(el => {
+            if (field.attr === 'srcset') {
+                if (!el.srcset) return el.src || '';
+                const parts = el.srcset.split(',');
+                return parts[parts.length - 1].trim().split(' ')[0];
+            }
+            if (field.attr) {
+                for (const name of [].concat(field.attr)) {
+                    const value = el.getAttribute(name);
+                    if (value) return field.absolute ? new URL(value, document.baseURI).href : value;
+                }
+                return '';
+            }
+            return el.innerText;
+        });
+        return values.join(' ').trim() || (field.default ?? '');
+    };
+    const y = el => el.getBoundingClientRect().top + window.scrollY;
+    const fields = Object.entries(spec.fields);
+    let results = [];
+    if (spec.header) {
+        document.querySelectorAll(spec.header).forEach(el => results.push({type: 'header', text: el.innerText, y: y(el)}));
+    }
+    document.querySelectorAll(spec.item).forEach(el => {
+        const item = spec.header ? {type: 'item'} : {};
+        for (const [key, field] of fields) item[key] = read(el, field);
+        for (const [key, field] of fields) {
+            if (field.remove) item[key] = item[key].split(item[field.remove]).join('').trim();
+        }
+        if (spec.header) item.y = y(el);
+        results.push(item);
+    });
+    return spec.header ? results.sort((a, b) => a.y - b.y) : results;
+}"""
+
+def extract_items(page, spec):
+    with span("extract") as stage:
+        found = page.evaluate(EXTRACT_JS, spec)
+        stage['items'] = sum(1 for el in found if el.get('type', 'item') == 'item')
+    return found
+
+def group_by_header(elements, default="Uncategorized"):
+    # [(header text, [items])] in page order; headers with no items are dropped
+    groups = []
+    name, items = default, []
+    for el in elements:
+        if el.get('type') == 'header':
+            if items: groups.append((name, items))
+            name, items = el['text'], []
+        else:
+            items.append(el)
+    if items: groups.append((name, items))
+    return groups
+
+def section_fingerprint(items):
+    # Scroll positions shift with layout, so they are left out
+    return fingerprint([{k: v for k, v in el.items() if k != 'y'} for el in items])
+
+class Crawl:
+    def __init__(self, adapter, url, progress_callback, image_root, images, state, policy):
+        self.adapter = adapter
+        self.url = url
+        self.log = progress_callback
+        self.image_root = image_root
+        self.images = images
+        self.state = state
+        self.policy = policy
+        self.restaurant_name = None
+
+    def queue_images(self, rows, revalidate):
+        for row in rows:
+            if row['Image URL'] and "http" in row['Image URL']:
+                queue_dish_image(self.images, self.image_root, self.restaurant_name, row['Category'], row['Dish'],
+                                 row['Price'], row['Image URL'], revalidate=revalidate)
+
+    def records(self, items, tab, category):
+        return [self.adapter.normalize(item, self.restaurant_name, tab, category, self.url) for item in items]
+
+    def reuse(self, tab, category, fp, rows):
+        # Serves a section from the last snapshot (already-cached images included)
+        if self.state: self.state.note_fingerprint(self.url, tab, category, fp)
+        for row in rows:
+            row.update({'Restaurant': self.restaurant_name, 'Tab': tab, 'Category': category})
+        self.queue_images(rows, revalidate=False)
+        return rows
+
+    def landing(self, page):
+        # The whole menu is on the landing page, split into sections by headers
+        items_spec = self.adapter.config['items']
+        with span("wait"):
+            _, waited_ms = scroll_until_stable(page, items_spec['item'])
+        report_wait_savings(self.log, waited_ms, 5000)
+
+        data = []
+        tab = self.adapter.config.get('tab', "Menu")
+        for header, items in group_by_header(self.adapter.extract(page)):
+            category = self.adapter.section_name(header)
+            self.log(f"--> Category: {category} // {len(items)} Items")
+            cat_fp = section_fingerprint(items)
+            unchanged = self.state is not None and self.state.category(self.url, tab, category)[0] == cat_fp
+            if self.state: self.state.note_fingerprint(self.url, tab, category, cat_fp)
+            rows = self.records(items, tab, category)
+            self.queue_images(rows, revalidate=not unchanged)
+            data.extend(rows)
+        return data
+
+    def sections(self, page, context, plan, waited_ms):
+        # Each section is its own page. Returns rows per plan entry, so output order
+        # matches the menu even though sections are fetched out of order.
+        items_spec = self.adapter.config['items']
+        tab_count = len({section['tab'] for section in plan})
+        fixed_ms = 2000 * tab_count + 1000 * len(plan)  # What the old hardcoded sleeps would have cost
+        self.log(f"🧭 Planned {len(plan)} categories across {tab_count} tabs "
+                 f"(1 landing page load instead of {1 + len(plan)})")
+
+        results = [None] * len(plan)
+        to_visit = []
+        for i, section in enumerate(plan):
+            known_fp, known_rows = self.state.category(self.url, section['tab'], section['name']) if self.state else (None, [])
+            page_fp = None
+            if self.state:
+                with span("fetch"):
+                    page_fp = http_fingerprint(section['href'], self.policy)
+            if page_fp and page_fp == known_fp:
+                # Cheap check passed: no browser visit, reuse rows and cached images
+                self.log(f"----> Category: {section['name']} // unchanged, {len(known_rows)} Items reused")
+                results[i] = self.reuse(section['tab'], section['name'], page_fp, known_rows)
+            else:
+                to_visit.append((i, known_fp, known_rows, page_fp))
+
+        # Navigations are started together and each page is extracted as soon as the
+        # one before it is done
+        pages = [page] + [context.new_page() for _ in range(min(self.adapter.config.get('section_pages', 1), len(to_visit)) - 1)]
+        for start in range(0, len(to_visit), len(pages)):
+            batch = list(zip(pages, to_visit[start:start + len(pages)]))
+            nav_errors = {}
+            for pg, (i, _, _, _) in batch:
+                try:
+                    goto(pg, plan[i]['href'], self.policy, kind="commit", wait_until="commit")
+                except Exception as e:
+                    nav_errors[i] = e
+
+            for pg, (i, known_fp, known_rows, page_fp) in batch:
+                tab, cat_name = plan[i]['tab'], plan[i]['name']
+                target = f"{tab} / {cat_name}"
+                if i in nav_errors:
+                    self.policy.note(self.url, 'skipped', 'navigate', target, str(nav_errors[i]).splitlines()[0])
+                if i in nav_errors or not wait_for_items(pg, plan[i]['href'], items_spec['item'], self.policy, self.url, target,
+                                                         timeout_ms=10000, state="attached", wait_until="commit"):
+                    if known_rows:
+                        # Keep the last good copy rather than dropping the category (and
+                        # reporting all of its dishes as removed)
+                        self.log(f"----> Category: {cat_name} // not loaded, {len(known_rows)} Items from the last run")
+                        self.policy.note(self.url, 'stale', 'wait', target, f"{len(known_rows)} items from the last snapshot")
+                        results[i] = self.reuse(tab, cat_name, known_fp, known_rows)
+                    else:
+                        self.log(f"----> Category: {cat_name} // not loaded, skipped")
+                    continue
+
+                with span("wait"):
+                    _, elapsed = scroll_until_stable(pg, items_spec['item'])
+                waited_ms += elapsed
+
+                items = [el for el in self.adapter.extract(pg) if el.get('type', 'item') == 'item']
+                self.log(f"----> Category: {cat_name} // {len(items)} Items")
+
+                cat_fp = page_fp or section_fingerprint(items)
+                if self.state: self.state.note_fingerprint(self.url, tab, cat_name, cat_fp)
+                rows = self.records(items, tab, cat_name)
+                self.queue_images(rows, revalidate=cat_fp != known_fp)
+                results[i] = rows
+
+        report_wait_savings(self.log, waited_ms, fixed_ms)
+        return [row for rows in results if rows for row in rows]
+
+def crawl(adapter, url, progress_callback, image_root, pool=None, images=None, state=None, policy=None):
+    data = []
+    with borrow_context(pool, adapter.name, **adapter.context_options()) as context, borrow_downloader(images) as images:
+        job = Crawl(adapter, url, progress_callback, image_root, images, state, policy or images.policy)
+        page = context.new_page()
+        try:
+            progress_callback(f"Accessing {adapter.name}: {url}")
+            goto(page, url, job.policy)
+            if not wait_for_items(page, url, adapter.config['ready'], job.policy, url, "menu"):
+                progress_callback(f"Could not load menu items for {url}")
+                return data
+
+            job.restaurant_name = adapter.restaurant_name(page, url)
+            progress_callback(f"Detected Name: {job.restaurant_name}")
+
+            plan, waited_ms = adapter.discover(page, progress_callback)
+            data = job.landing(page) if plan is None else job.sections(page, context, plan, waited_ms)
+        except Exception as e:
+            progress_callback(f"Error scraping {url}: {e}")
+    return data
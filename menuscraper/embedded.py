@@ -0,0 +1,55 @@
+import re
+import json
+import requests
+
+from .config import ODDMENU_USER_AGENT
+from .policy import CircuitOpenError
+
+# --- EMBEDDED PAGE JSON ---
+# Client-rendered menus usually ship their data inside the HTML (__NEXT_DATA__,
+# JSON-LD, other application/json scripts or window.__STATE__ assignments).
+_SCRIPT_RE = re.compile(r'<script([^>]*)>(.*?)</script>', re.S | re.I)
+_STATE_RE = re.compile(r'window\.__[A-Za-z0-9_]+__\s*=\s*(\{.*\})\s*;?\s*$', re.S)
+TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.S | re.I)
+
+_session = requests.Session()
+
+def fetch_html(url, policy, restaurant=None, target="page", report=True):
+    # Plain HTTP fetch (no browser) with the same UA the scrapers use, through the
+    # RequestPolicy like every page load. None on failure, which is recorded as an
+    # issue unless `report` is off (a probe whose miss is handled by the caller).
+    restaurant = restaurant or url
+    try:
+        with policy.request(url, "fetch", 15000) as timeout_ms:
+            response = _session.get(url, timeout=timeout_ms / 1000, headers={'User-Agent': ODDMENU_USER_AGENT})
+            # Counted against the host's circuit breaker; other errors are about this page only
+            if response.status_code == 429 or response.status_code >= 500:
+                raise requests.HTTPError(f"HTTP {response.status_code}")
+    except CircuitOpenError as e:
+        if report: policy.note(restaurant, 'skipped', 'fetch', target, str(e))
+        return None
+    except Exception as e:
+        if report: policy.note(restaurant, 'failed', 'fetch', target, str(e).splitlines()[0] if str(e) else type(e).__name__)
+        return None
+    if response.status_code != 200:
+        if report: policy.note(restaurant, 'failed', 'fetch', target, f"HTTP {response.status_code}")
+        return None
+    return response.text
+
+def embedded_json_blobs(page_html):
+    blobs = []
+    for attrs, body in _SCRIPT_RE.findall(page_html):
+        body = body.strip()
+        if not body: continue
+        candidate = None
+        if "application/json" in attrs or "application/ld+json" in attrs or "__NEXT_DATA__" in attrs:
+            candidate = body
+        else:
+            match = _STATE_RE.search(body)
+            if match: candidate = match.group(1)
+        if candidate is None: continue
+        try:
+            blobs.append(json.loads(candidate))
+        except ValueError:
+            pass
+    return blobs
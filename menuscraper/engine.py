@@ -0,0 +1,226 @@
+import os
+import shutil
+import pandas as pd
+
+from .config import STAGING_DIR, MAX_WORKERS
+from .browser import ResourceBlocker
+from .images import DUPLICATE_FIELDS, ImageCache, ImageDownloader
+from .thumbnails import Thumbnailer, check_thumbnail_format
+from .normalize import normalize_records
+from .state import SnapshotStore, CHANGE_FIELDS
+from .output import RowWriter, CsvSink, ArchiveWriter, save_individual_csv
+from .manifest import JobManifest
+from .timing import TIMING_FILES, SpanRecorder, span
+from .policy import ISSUE_FIELDS, RequestPolicy
+from .scheduler import detect_platform, scrape_batch
+from .platforms import ADAPTERS
+
+# --- BATCH ENGINE ---
+# Everything a run needs apart from a UI: reading the URL list, preparing the output
+# directory, scraping and packaging. The Streamlit app and the CLI are thin clients
+# that render the events yielded by run_batch().
+PLATFORM_FILTERS = {"all": None, **{name.lower(): name for name in ADAPTERS}}
+
+def read_url_file(file, filename):
+    # CSV/Excel with a 'url' column, or a plain text file with one URL per line
+    if filename.endswith('.txt'):
+        content = file.read()
+        if isinstance(content, bytes): content = content.decode('utf-8', errors='replace')
+        return pd.DataFrame({'url': [u.strip() for u in content.splitlines() if u.strip()]})
+    if filename.endswith('.csv'):
+        df = pd.read_csv(file, encoding="cp1252")
+    else:
+        df = pd.read_excel(file)
+    df.columns = [str(c).lower() for c in df.columns]
+    if 'url' not in df.columns:
+        raise ValueError("Column 'url' missing in file.")
+    return df
+
+def plan_jobs(df, platform=None):
+    # Returns [(index, url, platform)], keeping only `platform` when one is given
+    jobs = []
+    for index, row in df.iterrows():
+        url = str(row['url']).strip()
+        detected = detect_platform(url)
+        if platform and detected != platform: continue
+        jobs.append((index, url, detected))
+    return jobs
+
+def prepare_output_dir(out_dir):
+    # Clears the previous run's output folder and its zip
+    if os.path.exists(out_dir):
+        try:
+            shutil.rmtree(out_dir)
+        except:
+            pass
+    if os.path.exists(f"{out_dir}.zip"):
+        os.remove(f"{out_dir}.zip")
+    os.makedirs(out_dir, exist_ok=True)
+
+def run_batch(jobs, out_dir=STAGING_DIR, workers=MAX_WORKERS, platform_limits=None, block_profiles=None,
+              fast_path=None, use_image_cache=True, incremental=True, make_zip=True, output_formats=("csv",),
+              stage_images=True, resume=False, dedupe_images=True, thumbnails=None):
+    # Yields events in completion order:
+    #   ('resumed', skipped)  only when resuming; restaurants already done in an earlier run
+    #   ('log', index, url, message)
+    #   ('restaurant', index, url, platform, data, changes, csv_filename)
+    #   ('packaging',)        scraping is done; images are draining and the zip is being closed
+    #   ('finished', summary)
+    # Rows go straight to the master outputs as restaurants finish; nothing is held for
+    # the whole batch. Each restaurant's rows are normalized first (see normalize.py),
+    # so 'restaurant' events carry numeric prices and ISO currency codes.
+    # Raises ValueError before scraping if a requested format is unavailable.
+    # The zip is filled as files are written; with stage_images=False images only exist
+    # inside it.
+    # Progress is checkpointed in out_dir/manifest.json. With resume=True (and out_dir
+    # left in place) restaurants that completed earlier are skipped, the combined outputs
+    # continue from the last checkpoint, images already on disk are not fetched again,
+    # and images that were still queued at the checkpoint are queued again.
+    # Stage timings (launch, fetch, navigate, wait, extract, image, write) are exported to
+    # timings.json / timings.csv and summarised in summary['timings'].
+    # Page loads, plain HTML fetches and images share one RequestPolicy; anything it
+    # retried, skipped or served from the last snapshot is written to Issues.csv and
+    # listed in summary['issues'].
+    # With dedupe_images, an image identical to one already saved is stored once and
+    # Image_duplicates.csv maps each repeat to the copy that was kept. thumbnails="webp"
+    # or "jpeg" (needs Pillow) also writes a resized copy of every image to Thumbnails/.
+    out_dir = os.path.normpath(out_dir)
+    if resume and not stage_images:
+        raise ValueError("Resuming needs images staged on disk; an interrupted zip cannot be reopened.")
+    if thumbnails: check_thumbnail_format(thumbnails)
+    manifest = JobManifest.load(out_dir) if resume else JobManifest(out_dir)
+    positions = manifest.positions
+    writer = RowWriter(out_dir, output_formats, resume_from=positions)
+    changes_path = os.path.join(out_dir, "Menu_changes.csv")
+    changes_sink = CsvSink(changes_path, positions['changes'], CHANGE_FIELDS) if positions.get('changes') else None
+    issues_path = os.path.join(out_dir, "Issues.csv")
+    issues_sink = CsvSink(issues_path, positions['issues'], ISSUE_FIELDS) if positions.get('issues') else None
+    duplicates_path = os.path.join(out_dir, "Image_duplicates.csv")
+    todo = manifest.plan(jobs)
+    archive = ArchiveWriter(f"{out_dir}.zip", out_dir) if make_zip else None
+    resumed_duplicates = []
+    if archive and resume:
+        # Earlier restaurants' CSVs and images; the combined outputs and reports are added at the end.
+        # Deduplicated images are hardlinks on disk: they stay out of the zip and are listed again.
+        reports = [changes_path, issues_path, duplicates_path, manifest.path] + [os.path.join(out_dir, name) for name in TIMING_FILES]
+        resumed_duplicates = archive.add_tree(out_dir, exclude=list(writer.paths.values()) + reports, skip_links=dedupe_images)
+    image_cache = ImageCache() if use_image_cache else None
+    policy = RequestPolicy()
+    thumbnailer = Thumbnailer(out_dir, thumbnails, archive=archive, stage=stage_images) if thumbnails else None
+    images = ImageDownloader(cache=image_cache, archive=archive, stage=stage_images, policy=policy,
+                             dedupe=dedupe_images, thumbnails=thumbnailer)
+    images.duplicates.extend(resumed_duplicates)
+    for img_url, rel_path, revalidate in manifest.images:
+        images.submit(img_url, os.path.join(out_dir, rel_path), revalidate=revalidate)
+    blocker = ResourceBlocker(block_profiles)
+    state = SnapshotStore() if incremental else None
+    recorder = SpanRecorder()
+    timing_files = ()
+    all_changes = []
+    all_issues = []
+    last_log = {}
+
+    def pending_images():
+        return [(img_url, os.path.relpath(path, out_dir), revalidate) for img_url, path, revalidate in images.pending()]
+
+    def flush_issues():
+        nonlocal issues_sink
+        issues = policy.drain_issues()
+        if not issues: return
+        all_issues.extend(issues)
+        if issues_sink is None: issues_sink = CsvSink(issues_path, fields=ISSUE_FIELDS)
+        issues_sink.write(issues)
+
+    if len(todo) < len(jobs):
+        yield ('resumed', len(jobs) - len(todo))
+    try:
+        for event in scrape_batch(todo, out_dir, workers=workers, platform_limits=platform_limits, images=images,
+                                  blocker=blocker, fast_path=fast_path, state=state, recorder=recorder, policy=policy):
+            if event[0] == 'start':
+                manifest.mark(event[1], 'running')
+                continue
+            if event[0] == 'log':
+                last_log[event[1]] = event[3]
+                yield event
+                continue
+
+            _, index, url, platform, data, changes = event
+            csv_filename = None
+            with span("normalize", active=(recorder, url), items=len(data)):
+                data = normalize_records(data)
+            with span("write", active=(recorder, url), items=len(data)):
+                writer.write(data)
+                if changes:
+                    all_changes.extend(changes)
+                    if changes_sink is None: changes_sink = CsvSink(changes_path, fields=CHANGE_FIELDS)
+                    changes_sink.write(changes)
+                if data:
+                    # Filename format: RestaurantName_Platform.csv
+                    csv_filename = save_individual_csv(data, out_dir, data[0]['Restaurant'], platform or "Unknown")
+                    if archive: archive.add(os.path.join(out_dir, csv_filename))
+                flush_issues()
+            if data:
+                checkpoint = writer.positions()
+                if changes_sink: checkpoint['changes'] = changes_sink.position()
+                if issues_sink: checkpoint['issues'] = issues_sink.position()
+                manifest.mark(index, 'done', positions=checkpoint, images=pending_images(), rows=len(data),
+                              csv=csv_filename, error=None)
+            else:
+                manifest.mark(index, 'failed', images=pending_images(), error=last_log.get(index))
+            yield ('restaurant', index, url, platform, data, changes, csv_filename)
+
+        yield ('packaging',)
+        writer.close()
+        if changes_sink: changes_sink.close()
+        images.close()
+        manifest.set_images(pending_images())
+        if thumbnailer: thumbnailer.close()
+        flush_issues()
+        if issues_sink: issues_sink.close()
+        if images.duplicates:
+            duplicates_sink = CsvSink(duplicates_path, fields=DUPLICATE_FIELDS)
+            duplicates_sink.write([dict(zip(DUPLICATE_FIELDS, (os.path.relpath(path, out_dir).replace(os.sep, '/') for path in pair)))
+                                   for pair in images.duplicates])
+            duplicates_sink.close()
+        timing_files = recorder.export(out_dir)
+        total_rows = manifest.rows()
+        if archive and total_rows:
+            for path in writer.paths.values():
+                if os.path.isdir(path): archive.add_tree(path)
+                else: archive.add(path)
+            if changes_sink: archive.add(changes_path)
+            if issues_sink: archive.add(issues_path)
+            if images.duplicates: archive.add(duplicates_path)
+            for path in timing_files: archive.add(path)
+    finally:
+        writer.close()
+        if changes_sink: changes_sink.close()
+        if issues_sink: issues_sink.close()
+        images.close()
+        if thumbnailer: thumbnailer.close()
+        if archive: archive.close()
+        if image_cache: image_cache.close()
+        if state: state.close()
+
+    summary = {
+        'rows': total_rows,
+        'changes': all_changes,
+        'master_csv': writer.paths['csv'] if total_rows else None,
+        'outputs': writer.paths,
+        'changes_csv': changes_path if changes_sink else None,
+        'issues': all_issues,
+        'issues_csv': issues_path if issues_sink else None,
+        'policy': policy.stats,
+        'zip': archive.path if archive and total_rows else None,
+        'manifest': manifest.path,
+        'jobs': manifest.counts(),
+        'timings': recorder.summary(),
+        'timing_files': timing_files,
+        'images': images.stats,
+        'duplicates_csv': duplicates_path if images.duplicates else None,
+        'thumbnails': thumbnailer.stats if thumbnailer else None,
+        'cache': image_cache.stats if image_cache else None,
+        'cache_bytes': image_cache.total_bytes if image_cache else 0,
+        'blocked': blocker.stats,
+    }
+    yield ('finished', summary)
@@ -0,0 +1,171 @@
+import re
+import html
+
+from .utils import clean_filename
+from .embedded import TITLE_RE, fetch_html, embedded_json_blobs
+from .images import queue_dish_image
+from .state import fingerprint
+from .timing import span
+from .finedine import finedine_name_from_title, split_finedine_price, strip_blur_filter
+
+# --- FAST PATH: EMBEDDED MENU JSON ---
+# Both platforms render client-side from JSON that is usually embedded in the HTML
+# (__NEXT_DATA__, JSON-LD, other application/json scripts or window.__STATE__ blobs).
+# When we can read the menu straight from it, no browser is needed at all. The JSON
+# layouts are not documented, so items are found structurally: any object with a
+# name and a price is a dish, and the named objects above it are its category/tab.
+NAME_KEYS = ("name", "title", "label")
+PRICE_KEYS = ("price", "amount", "basePrice", "priceValue", "price_value")
+CURRENCY_KEYS = ("currency", "currencyCode", "priceCurrency", "currency_code")
+DESCRIPTION_KEYS = ("description", "desc", "details")
+IMAGE_KEYS = ("image", "imageUrl", "image_url", "img", "photo", "picture", "thumbnail")
+
+def _text(value):
+    # Localised fields often look like {"en": "...", "ar": "..."}
+    if isinstance(value, str): return value.strip()
+    if isinstance(value, dict):
+        if isinstance(value.get("en"), str): return value["en"].strip()
+        for v in value.values():
+            if isinstance(v, str): return v.strip()
+    return ""
+
+def _arabic(node, keys):
+    # The "ar" side of a localised field, or a sibling key such as name_ar / nameAr
+    value = _first(node, keys)
+    if isinstance(value, dict) and isinstance(value.get("ar"), str): return value["ar"].strip()
+    for key in keys:
+        for variant in (f"{key}_ar", f"{key}Ar", f"{key}_AR"):
+            if isinstance(node.get(variant), str): return node[variant].strip()
+    return ""
+
+def _first(node, keys):
+    for key in keys:
+        if key in node and node[key] not in (None, "", [], {}):
+            return node[key]
+    return None
+
+def _price_of(node):
+    price = _first(node, PRICE_KEYS)
+    if price is None and isinstance(node.get("offers"), (dict, list)):
+        offers = node["offers"]
+        offer = offers[0] if isinstance(offers, list) and offers else offers
+        if isinstance(offer, dict): price = _first(offer, PRICE_KEYS)
+    if isinstance(price, dict): price = _first(price, ("amount", "value", "price"))
+    if isinstance(price, bool): return None
+    if isinstance(price, float) and price.is_integer(): price = int(price)
+    if isinstance(price, (int, float)): return str(price)
+    if isinstance(price, str) and re.search(r'\d', price): return price.strip()
+    return None
+
+def _currency_of(node):
+    currency = _first(node, CURRENCY_KEYS)
+    if currency is None and isinstance(node.get("offers"), dict): currency = _first(node["offers"], CURRENCY_KEYS)
+    if isinstance(node.get("price"), dict): currency = currency or _first(node["price"], CURRENCY_KEYS)
+    if isinstance(currency, dict): currency = _first(currency, ("code", "symbol", "name"))
+    return currency.strip() if isinstance(currency, str) else None
+
+def _image_of(node):
+    image = _first(node, IMAGE_KEYS)
+    if isinstance(image, list): image = image[0] if image else None
+    if isinstance(image, dict): image = _first(image, ("url", "src", "original", "large"))
+    return image if isinstance(image, str) else ""
+
+def find_menu_items(payload):
+    # Returns [(trail_of_names, item_dict, inherited_currency)] in document order
+    found = []
+
+    def visit(node, trail, currency):
+        if isinstance(node, list):
+            for child in node: visit(child, trail, currency)
+            return
+        if not isinstance(node, dict): return
+        currency = _currency_of(node) or currency
+        name = _text(_first(node, NAME_KEYS))
+        if name and _price_of(node) is not None:
+            found.append((trail, node, currency))
+            return
+        child_trail = trail + [name] if name else trail
+        for value in node.values():
+            if isinstance(value, (dict, list)): visit(value, child_trail, currency)
+
+    visit(payload, [], None)
+    return found
+
+def _tab_of(trail, restaurant_name):
+    # The level above the category, as the browser crawler's tab; a leading
+    # restaurant object (FineDine's state wraps the menu in one) is not a tab
+    if trail and trail[0].casefold() == (restaurant_name or "").casefold(): trail = trail[1:]
+    return trail[-2] if len(trail) >= 2 else "Menu"
+
+def map_fast_path_records(items, restaurant_name, url, platform):
+    # Same record schema (and per-platform conventions) as the browser scrapers
+    data = []
+    for trail, node, currency in items:
+        cat_name = trail[-1] if trail else "Uncategorized"
+        tab_name = _tab_of(trail, restaurant_name)
+        dish_name = _text(_first(node, NAME_KEYS))
+        description = _text(_first(node, DESCRIPTION_KEYS))
+        price = _price_of(node)
+        image_url = _image_of(node)
+        if platform == "FineDine":
+            # FineDine prices arrive as "AED 45" strings in the DOM; keep the same split
+            price, parsed_currency = split_finedine_price(f"{currency or ''} {price}".strip())
+            currency = parsed_currency
+            cat_name, dish_name, tab_name = clean_filename(cat_name), clean_filename(dish_name), "Menu"
+            image_url = strip_blur_filter(image_url)
+        data.append({
+            'Restaurant': restaurant_name,
+            'Tab': tab_name,
+            'Category': cat_name,
+            'Dish': dish_name,
+            'Description': description,
+            'Dish (AR)': _arabic(node, NAME_KEYS),
+            'Description (AR)': _arabic(node, DESCRIPTION_KEYS),
+            'Price': price,
+            'Currency': currency or "",
+            'Image URL': image_url,
+            'Source': url,
+            'Platform': platform
+        })
+    return data
+
+def restaurant_name_from_html(page_html, url, platform):
+    match = TITLE_RE.search(page_html)
+    page_title = html.unescape(match.group(1)).strip() if match else ""
+    if platform == "FineDine":
+        name = finedine_name_from_title(page_title).replace("Menu", "").strip()
+        return name or "Unknown_FineDine"
+    return page_title.split('|')[0].strip() or url.split('/')[-1]
+
+def scrape_fast_path(url, platform, progress_callback, image_root, images, state=None, policy=None):
+    # Returns [] when the page has no usable embedded menu; callers fall back to the browser.
+    # The fetch goes through `policy` (the image pipeline's own when not given).
+    with span("fetch") as stage:
+        page_html = fetch_html(url, policy or images.policy, url, "embedded menu")
+        stage['bytes'] = len(page_html or "")
+    if page_html is None: return []
+
+    best, best_blob = [], None
+    with span("extract") as stage:
+        for blob in embedded_json_blobs(page_html):
+            items = find_menu_items(blob)
+            if len(items) > len(best): best, best_blob = items, blob
+        stage['items'] = len(best)
+    if not best: return []
+
+    restaurant_name = restaurant_name_from_html(page_html, url, platform)
+    data = map_fast_path_records(best, restaurant_name, url, platform)
+    progress_callback(f"⚡ Fast path: read {len(data)} items from embedded menu JSON")
+
+    unchanged = False
+    if state:
+        menu_fp = fingerprint(best_blob)
+        unchanged = state.restaurant_fingerprint(url) == menu_fp
+        state.note_fingerprint(url, value=menu_fp)
+        if unchanged: progress_callback("Menu JSON unchanged since last run, reusing cached images")
+
+    for record in data:
+        if record['Image URL'] and "http" in record['Image URL']:
+            queue_dish_image(images, image_root, restaurant_name, record['Category'], record['Dish'], record['Price'],
+                             record['Image URL'], revalidate=not unchanged)
+    return data
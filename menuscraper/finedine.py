@@ -0,0 +1,63 @@
+import re
+
+from .utils import clean_filename
+from .platforms import ADAPTERS, PlatformAdapter, register
+from .crawler import crawl
+
+# --- SCRAPER: FINEDINE ---
+def finedine_name_from_title(page_title):
+    if "|" in page_title: restaurant_name = page_title.split("|")[0].strip()
+    elif "-" in page_title: restaurant_name = page_title.split("-")[0].strip()
+    else: restaurant_name = page_title
+    return restaurant_name
+
+def split_finedine_price(raw_price):
+    # "AED 45.00" -> ("45.00", "AED"), "1,250.00 SAR" -> ("1,250.00", "SAR"); missing
+    # prices become ("0", "NA"). Separators are kept: normalize.py reads the number.
+    currency = "NA"
+    price_val = "0"
+    
+    if raw_price != "NA":
+        match = re.search(r'\d[\d.,]*\d|\d', raw_price)
+        if match:
+            price_val = match.group()
+            currency = raw_price.replace(price_val, "").strip()
+        else:
+            price_val = raw_price
+    
+    if not currency: currency = "NA"
+    return price_val, currency
+
+def strip_blur_filter(image_url):
+    if image_url and "http" in image_url:
+        image_url = image_url.replace("filters:blur(125)/", "").replace("filters:blur(125)", "")
+    return image_url
+
+@register("FineDine")
+class FineDineAdapter(PlatformAdapter):
+    # The whole menu is one page, split into categories by headers
+    def restaurant_name(self, page, url):
+        name = self.title_text(page) or finedine_name_from_title(page.title())
+        return name.replace("Menu", "").strip() or "Unknown_FineDine"
+
+    def section_name(self, text):
+        return clean_filename(text)
+
+    def normalize(self, item, restaurant, tab, category, url):
+        price_val, currency = split_finedine_price(item['price_full'].strip())
+        return {
+            'Restaurant': restaurant,
+            'Tab': tab,
+            'Category': category,
+            'Dish': clean_filename(item['name']),
+            'Description': item['description'].strip(),
+            'Price': price_val,
+            'Currency': currency,
+            'Image URL': strip_blur_filter(item['img']),
+            'Source': url,
+            'Platform': self.name,
+        }
+
+def run_scrape_finedine(url, progress_callback, image_root, pool=None, images=None, state=None, policy=None):
+    return crawl(ADAPTERS["FineDine"], url, progress_callback, image_root, pool=pool, images=images, state=state,
+                 policy=policy)
@@ -0,0 +1,339 @@
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+import sqlite3
+import threading
+import queue
+import requests
+from contextlib import contextmanager
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+from requests.adapters import HTTPAdapter
+
+from .config import (
+    IMAGE_WORKERS, IMAGE_PER_HOST, IMAGE_RETRIES, IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES,
+)
+from .utils import clean_filename
+from .timing import span, current
+from .policy import RequestPolicy, CircuitOpenError
+
+class RetryableDownloadError(Exception):
+    pass
+
+def stream_to_file(response, save_path):
+    # Streams the body to a temp file and renames it into place, so a failed or
+    # interrupted download never leaves a truncated image behind.
+    tmp_path = f"{save_path}.{threading.get_ident()}.part"
+    written = 0
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)
+                written += len(chunk)
+        os.replace(tmp_path, save_path)
+    except Exception:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+        raise
+    return written
+
+def check_image_response(response):
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RetryableDownloadError(f"HTTP {response.status_code}")
+    return response.status_code == 200
+
+def fetch_image(session, img_url, save_path, timeout=10, revalidate=True):
+    # Returns bytes received over the network, or None if the image is unavailable
+    with session.get(img_url, timeout=timeout, stream=True) as response:
+        if not check_image_response(response): return None
+        return stream_to_file(response, save_path)
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def link_or_copy(src_path, dest_path):
+    if os.path.exists(dest_path): os.remove(dest_path)
+    try:
+        os.link(src_path, dest_path)
+    except OSError:
+        shutil.copyfile(src_path, dest_path)
+
+# --- PERSISTENT IMAGE CACHE ---
+# Images survive between runs in a store outside STAGING_DIR, keyed by the normalized
+# URL. Repeat runs revalidate with If-None-Match / If-Modified-Since and, on a 304,
+# hardlink (or copy) the cached file into the restaurant folder.
+class ImageCache:
+    def __init__(self, root=IMAGE_CACHE_DIR, max_bytes=IMAGE_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'bytes_saved': 0, 'evicted': 0}
+        os.makedirs(os.path.join(root, "blobs"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, "index.db"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS images ("
+            "key TEXT PRIMARY KEY, url TEXT, etag TEXT, last_modified TEXT, size INTEGER, last_used REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS images_last_used ON images (last_used)")
+        self._db.commit()
+        self.total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM images").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def normalize_url(img_url):
+        parts = urlsplit(img_url.strip())
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+    def _blob_path(self, key):
+        return os.path.join(self.root, "blobs", key[:2], key)
+
+    def fetch(self, session, img_url, save_path, timeout=10, revalidate=True):
+        # Drop-in replacement for fetch_image(). revalidate=False serves a cached copy
+        # without touching the network (used for menu categories known to be unchanged).
+        key = hashlib.sha256(self.normalize_url(img_url).encode()).hexdigest()
+        blob = self._blob_path(key)
+        with self._lock:
+            row = self._db.execute("SELECT etag, last_modified, size FROM images WHERE key = ?", (key,)).fetchone()
+            if row and not revalidate and os.path.exists(blob):
+                self._db.execute("UPDATE images SET last_used = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+                self.stats['hits'] += 1
+                self.stats['bytes_saved'] += row[2]
+                link_or_copy(blob, save_path)
+                return 0
+
+        headers = {}
+        if row and os.path.exists(blob):
+            if row[0]: headers['If-None-Match'] = row[0]
+            if row[1]: headers['If-Modified-Since'] = row[1]
+
+        with session.get(img_url, timeout=timeout, stream=True, headers=headers) as response:
+            if response.status_code == 304 and headers:
+                with self._lock:
+                    # Another thread may have evicted it while we were revalidating
+                    if not os.path.exists(blob): raise RetryableDownloadError("evicted during revalidation")
+                    self._db.execute("UPDATE images SET last_used = ? WHERE key = ?", (time.time(), key))
+                    self._db.commit()
+                    self.stats['hits'] += 1
+                    self.stats['bytes_saved'] += row[2]
+                    link_or_copy(blob, save_path)
+                return 0
+            if not check_image_response(response): return None
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            written = stream_to_file(response, blob)
+            etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+
+        with self._lock:
+            # Re-read: another thread may have stored the same URL while this one downloaded
+            existing = self._db.execute("SELECT size FROM images WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO images (key, url, etag, last_modified, size, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, img_url, etag, last_modified, written, time.time())
+            )
+            self.total_bytes += written - (existing[0] if existing else 0)
+            self.stats['misses'] += 1
+            self._evict(keep=key)
+            self._db.commit()
+            link_or_copy(blob, save_path)
+        return written
+
+    def _evict(self, keep):
+        # Called with the lock held; removes least recently used entries past the cap
+        while self.total_bytes > self.max_bytes:
+            victims = self._db.execute(
+                "SELECT key, size FROM images WHERE key != ? ORDER BY last_used LIMIT 50", (keep,)
+            ).fetchall()
+            if not victims: return
+            for key, size in victims:
+                try:
+                    os.remove(self._blob_path(key))
+                except OSError:
+                    pass
+                self._db.execute("DELETE FROM images WHERE key = ?", (key,))
+                self.total_bytes -= size
+                self.stats['evicted'] += 1
+                if self.total_bytes <= self.max_bytes: return
+
+
+# --- IMAGE PIPELINE ---
+# Scrapers only enqueue (url, path) jobs; a pool of threads downloads them over one
+# keep-alive session while the browser moves on to the next category.
+# With an `archive`, every saved image is also added to the zip. stage=False keeps
+# images out of the output folder entirely: they are spooled to a temp file (a hardlink
+# to the cache blob when cached), added to the zip under their usual path, and deleted.
+# Every fetch goes through the `policy` (rate limit, breaker, adaptive timeout, backoff);
+# images that fail or are given up on are recorded there as issues.
+# With dedupe=True, images are compared by content hash: chains reuse the same photo
+# across branches and categories, so a repeat becomes a hardlink to the first copy on
+# disk and is left out of the archive, and `duplicates` lists (path, first path) pairs.
+# Each stored (non-duplicate) image is handed to the optional `thumbnails` stage.
+DUPLICATE_FIELDS = ['Image', 'Same as']
+
+class ImageDownloader:
+    def __init__(self, workers=IMAGE_WORKERS, per_host=IMAGE_PER_HOST, retries=IMAGE_RETRIES, timeout=10, cache=None,
+                 archive=None, stage=True, policy=None, dedupe=True, thumbnails=None):
+        self.per_host = max(1, per_host)
+        self.retries = retries
+        self.timeout = timeout
+        self.cache = cache
+        self.archive = archive
+        self.stage = stage or archive is None
+        self.policy = policy or RequestPolicy()
+        self.dedupe = dedupe
+        self.thumbnails = thumbnails
+        self.duplicates = []
+        self._spool = None if self.stage else tempfile.mkdtemp(prefix="menu-images-")
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(workers, self.per_host))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.stats = {'queued': 0, 'downloaded': 0, 'failed': 0, 'retries': 0, 'bytes': 0, 'duplicates': 0, 'bytes_deduped': 0}
+        self._jobs = queue.Queue()
+        self._seen = set()
+        self._pending = {}
+        self._digests = {}
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(max(1, workers))]
+        for t in self._threads: t.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, img_url, save_path, revalidate=True):
+        if not img_url: return
+        with self._lock:
+            if save_path in self._seen or (self.stage and os.path.exists(save_path)): return
+            self._seen.add(save_path)
+            self._pending[save_path] = (img_url, revalidate)
+            self.stats['queued'] += 1
+        # Timing spans are credited to the restaurant that queued the image
+        self._jobs.put((img_url, save_path, revalidate, current()))
+
+    def join(self):
+        self._jobs.join()
+
+    def pending(self):
+        # [(img_url, save_path, revalidate)] queued or in flight; checkpointed so a
+        # resumed run can queue them again
+        with self._lock:
+            return [(img_url, save_path, revalidate) for save_path, (img_url, revalidate) in self._pending.items()]
+
+    def close(self):
+        # Drains everything still queued before stopping the workers; safe to call twice
+        if not any(t.is_alive() for t in self._threads): return
+        for _ in self._threads: self._jobs.put(None)
+        for t in self._threads: t.join()
+        self.session.close()
+        # Unstaged thumbnails are made from files in the spool, so they go first
+        if self.thumbnails: self.thumbnails.close()
+        if self._spool: shutil.rmtree(self._spool, ignore_errors=True)
+
+    def _host_slot(self, img_url):
+        host = urlparse(img_url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return self._hosts[host]
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None: return
+                img_url, save_path, revalidate, active = job
+                with span("image", active=active) as stage:
+                    self._download(img_url, save_path, revalidate, stage, active)
+                with self._lock: self._pending.pop(save_path, None)
+            finally:
+                self._jobs.task_done()
+
+    def _store(self, target, save_path, active):
+        # Called once `target` holds the image meant for `save_path`
+        first = None
+        if self.dedupe:
+            digest = file_digest(target)
+            size = os.path.getsize(target)
+            with self._lock:
+                first = self._digests.setdefault(digest, save_path)
+                if first != save_path:
+                    self.duplicates.append((save_path, first))
+                    self.stats['duplicates'] += 1
+                    self.stats['bytes_deduped'] += size
+        if first and first != save_path:
+            if self.stage: link_or_copy(first, target)
+            else: os.remove(target)
+            return
+        if self.archive: self.archive.add(target, self.archive.arcname(save_path))
+        if self.thumbnails: self.thumbnails.submit(target, save_path, cleanup=not self.stage, active=active)
+        elif not self.stage: os.remove(target)
+
+    def _download(self, img_url, save_path, revalidate, stage, active):
+        restaurant = active[1] if active else ""
+        if self.stage:
+            target = save_path
+            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        else:
+            target = os.path.join(self._spool, hashlib.sha1(save_path.encode()).hexdigest() + os.path.splitext(save_path)[1])
+        for attempt in range(self.retries + 1):
+            try:
+                fetch = self.cache.fetch if self.cache else fetch_image
+                with self._host_slot(img_url), self.policy.request(img_url, "image", self.timeout * 1000) as timeout_ms:
+                    written = fetch(self.session, img_url, target, timeout=timeout_ms / 1000, revalidate=revalidate)
+                if written is not None: self._store(target, save_path, active)
+                stage.update(bytes=written or 0, retries=attempt, ok=written is not None)
+                with self._lock:
+                    if written is None:
+                        self.stats['failed'] += 1
+                    else:
+                        self.stats['downloaded'] += 1
+                        self.stats['bytes'] += written
+                if written is None:
+                    self.policy.note(restaurant, 'failed', 'image', img_url, "not available")
+                elif attempt:
+                    self.policy.note(restaurant, 'retried', 'image', img_url, f"saved after {attempt} retries")
+                return
+            except CircuitOpenError as e:
+                self.policy.note(restaurant, 'skipped', 'image', img_url, str(e))
+                break
+            except (RetryableDownloadError, requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.retries:
+                    self.policy.note(restaurant, 'failed', 'image', img_url, f"gave up after {attempt + 1} attempts: {e}")
+                    break
+                with self._lock: self.stats['retries'] += 1
+                time.sleep(self.policy.backoff(attempt))
+            except Exception as e:
+                self.policy.note(restaurant, 'failed', 'image', img_url, str(e))
+                break
+        stage.update(retries=attempt, ok=False)
+        with self._lock: self.stats['failed'] += 1
+
+
+def queue_dish_image(images, image_root, restaurant_name, cat_name, dish_name, price, img_url, revalidate=True):
+    # Images land in <root>/<restaurant>/<category>/<dish>_<price>.<ext>
+    if not img_url or not image_root: return
+    folder = os.path.join(image_root, clean_filename(restaurant_name), clean_filename(cat_name))
+    ext = ".png" if ".png" in img_url else ".jpg"
+    fname = f"{clean_filename(dish_name)}_{clean_filename(price)}{ext}"
+    images.submit(img_url, os.path.join(folder, fname), revalidate=revalidate)
+
+
+@contextmanager
+def borrow_downloader(images):
+    # Scrapers called on their own get a private downloader that is drained on exit.
+    if images is not None:
+        yield images
+        return
+    with ImageDownloader() as own_images:
+        yield own_images
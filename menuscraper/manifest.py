@@ -0,0 +1,78 @@
+import os
+import json
+import time
+
+# --- JOB MANIFEST ---
+# <out_dir>/manifest.json records every restaurant's status (pending, running, done,
+# failed), its output files, how far the combined outputs had been written when
+# the last restaurant completed, and the image downloads still queued at that point
+# (a restaurant is done once its rows are written, while its images may still be in
+# flight). It is rewritten atomically (temp file + os.replace)
+# after every change, so a run that dies midway can be resumed from it.
+MANIFEST_NAME = "manifest.json"
+
+class JobManifest:
+    def __init__(self, out_dir):
+        self.path = os.path.join(out_dir, MANIFEST_NAME)
+        self.data = {'version': 1, 'created': time.time(), 'jobs': {}, 'positions': {}, 'images': []}
+
+    @classmethod
+    def load(cls, out_dir):
+        # Returns the saved manifest, or an empty one if there is nothing to resume
+        manifest = cls(out_dir)
+        try:
+            with open(manifest.path, encoding='utf-8') as f:
+                manifest.data = json.load(f)
+        except (OSError, ValueError):
+            pass
+        return manifest
+
+    @property
+    def positions(self):
+        # {sink: position} at the last completed restaurant; see RowWriter
+        return self.data['positions']
+
+    @property
+    def images(self):
+        # [(img_url, path relative to out_dir, revalidate)] not yet downloaded at the last checkpoint
+        return self.data.get('images', [])
+
+    def plan(self, jobs):
+        # Registers `jobs` and returns the ones still to do. A job counts as done only if
+        # the same URL completed at the same index; failed and running jobs are retried.
+        todo = []
+        for index, url, platform in jobs:
+            entry = self.data['jobs'].get(str(index))
+            if entry and entry['url'] == url and entry['status'] == 'done': continue
+            self.data['jobs'][str(index)] = {'url': url, 'platform': platform, 'status': 'pending',
+                                             'rows': 0, 'csv': None, 'error': None, 'updated': time.time()}
+            todo.append((index, url, platform))
+        self.save()
+        return todo
+
+    def mark(self, index, status, positions=None, images=None, **fields):
+        self.data['jobs'][str(index)].update(fields, status=status, updated=time.time())
+        if positions is not None: self.data['positions'] = positions
+        if images is not None: self.data['images'] = images
+        self.save()
+
+    def set_images(self, images):
+        self.data['images'] = images
+        self.save()
+
+    def counts(self):
+        counts = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        for entry in self.data['jobs'].values():
+            counts[entry['status']] += 1
+        return counts
+
+    def rows(self):
+        return sum(entry['rows'] for entry in self.data['jobs'].values() if entry['status'] == 'done')
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
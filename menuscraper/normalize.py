@@ -0,0 +1,118 @@
+import pandas as pd
+
+from .output import RECORD_FIELDS
+
+# --- NORMALIZATION ---
+# One pass over a batch of records with vectorized pandas string ops, so every
+# platform (and the fast path) ends up with the same conventions:
+#   Price       a number ("1,250.00", "1.250,00 €", "AED 45" and "٤٥" all parse), None
+#               when missing or unreadable. "1,250" and "1.250" read as either; the
+#               currency decides (a comma is the decimal mark in DECIMAL_COMMA)
+#   Currency    an ISO 4217 code where the symbol or word is known; "" when unknown
+#               (FineDine used 'NA' and OddMenu '' for the same thing)
+#   Dish (AR), Description (AR)
+#               Arabic text from the page: a localized field the scraper already
+#               filled, or else the Arabic part of a bilingual name ("Hummus حمص")
+# Text is whitespace-collapsed, and exact repeats of a dish within a category dropped.
+TEXT_FIELDS = ['Restaurant', 'Tab', 'Category', 'Dish', 'Description', 'Dish (AR)', 'Description (AR)']
+DEDUPE_FIELDS = ['Source', 'Tab', 'Category', 'Dish', 'Description', 'Price', 'Currency']
+MISSING_CURRENCY = {"", "NA", "N/A", "NAN", "NONE", "NULL", "-"}
+CURRENCY_ALIASES = {
+    "AED": "AED", "DHS": "AED", "DH": "AED", "DHS.": "AED", "د.إ": "AED", "درهم": "AED",
+    "SAR": "SAR", "SR": "SAR", "ر.س": "SAR", "ريال": "SAR",
+    "QAR": "QAR", "QR": "QAR", "ر.ق": "QAR",
+    "KWD": "KWD", "KD": "KWD", "د.ك": "KWD",
+    "BHD": "BHD", "BD": "BHD", "د.ب": "BHD",
+    "OMR": "OMR", "RO": "OMR", "ر.ع.": "OMR", "ر.ع": "OMR",
+    "EGP": "EGP", "LE": "EGP", "E£": "EGP", "ج.م": "EGP", "جنيه": "EGP",
+    "JOD": "JOD", "JD": "JOD", "د.أ": "JOD",
+    "TRY": "TRY", "TL": "TRY", "₺": "TRY",
+    "USD": "USD", "$": "USD", "US$": "USD",
+    "EUR": "EUR", "€": "EUR",
+    "GBP": "GBP", "£": "GBP",
+}
+ARABIC = "\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF"   # Arabic script blocks
+ARABIC_RUN = rf"[{ARABIC}][{ARABIC}\s\d().,،-]*"
+LOCAL_DIGITS = "٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹٫٬"   # Arabic-Indic and Persian digits, decimal and thousands marks
+DIGITS = str.maketrans(LOCAL_DIGITS, "01234567890123456789.,")
+DECIMAL_COMMA = {"EUR", "TRY"}   # Currencies whose menus usually write 12,50
+NUMBER = r"(\d[\d.,]*\d|\d)"
+DOT_NUMBER = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?"      # 1,250.00
+COMMA_NUMBER = r"\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+(?:,\d+)?"     # 1.250,00
+
+def normalize_currency(currency):
+    code = currency.str.strip().str.upper()
+    code = code.where(~code.isin(MISSING_CURRENCY), "")
+    return code.map(CURRENCY_ALIASES).fillna(code)
+
+def parse_number(number, decimal_comma):
+    # Number strings -> floats (NaN when neither reading fits). decimal_comma is a
+    # boolean Series picking the comma reading where both are valid.
+    number = number.fillna("")
+    as_dot = pd.to_numeric(number.where(number.str.fullmatch(DOT_NUMBER), "").str.replace(",", "", regex=False), errors="coerce")
+    as_comma = number.where(number.str.fullmatch(COMMA_NUMBER), "").str.replace(".", "", regex=False)
+    as_comma = pd.to_numeric(as_comma.str.replace(",", ".", regex=False), errors="coerce")
+    return as_comma.where(as_comma.notna() & (decimal_comma | as_dot.isna()), as_dot)
+
+def split_arabic(text):
+    # (text without its Arabic part, Arabic part) for a Series; rows with no Arabic
+    # keep their text and get "". A name that is only Arabic is kept in both.
+    has_arabic = text.str.contains(f"[{ARABIC}]", regex=True)
+    latin, arabic = text.copy(), pd.Series("", index=text.index)
+    if has_arabic.any():
+        mixed = text[has_arabic]
+        arabic[has_arabic] = mixed.str.extract(f"({ARABIC_RUN})", expand=False).str.strip(" -()،,.")
+        rest = mixed.str.replace(ARABIC_RUN, " ", regex=True).str.replace(r"\s+", " ", regex=True).str.strip(" -|/()،,.")
+        latin[has_arabic] = rest.where(rest.str.contains(r"[A-Za-z]", regex=True), mixed)
+    return latin, arabic
+
+def normalize_frame(df):
+    df = df.reindex(columns=list(dict.fromkeys(RECORD_FIELDS + list(df.columns))))
+    for field in TEXT_FIELDS + ['Currency', 'Image URL', 'Source', 'Platform']:
+        df[field] = df[field].fillna("").astype(str)
+    for field in TEXT_FIELDS:
+        text = df[field].str.strip()
+        runs = text.str.contains(r"\s\s|[^\S ]", regex=True)
+        df[field] = text.where(~runs, text.str.replace(r"\s+", " ", regex=True)) if runs.any() else text
+
+    raw_price = df['Price'].fillna("").astype(str).str.strip()
+    price = pd.to_numeric(raw_price, errors="coerce")
+    # Only prices that aren't plain numbers need the regex work
+    messy = price.isna() & (raw_price != "")
+    leftover = pd.Series("", index=df.index)
+    if messy.any():
+        text = raw_price[messy]
+        local_digits = text.str.contains(f"[{LOCAL_DIGITS}]", regex=True)
+        text = text.where(~local_digits, text.str.translate(DIGITS))
+        number = text.str.extract(NUMBER, expand=False)
+        # A currency written into the price ("AED 45", "45 د.إ") is used when there is no other
+        rest = text.str.replace(NUMBER, "", regex=True).str.strip()
+        leftover[messy] = rest.where(rest.str.upper().isin(CURRENCY_ALIASES) | rest.str.fullmatch(r"[A-Z]{3}"), "")
+    currency = df['Currency'].where(~df['Currency'].str.strip().str.upper().isin(MISSING_CURRENCY), leftover)
+    df['Currency'] = normalize_currency(currency)
+    decimal_comma = df['Currency'].isin(DECIMAL_COMMA)
+    if messy.any():
+        price[messy] = parse_number(number, decimal_comma[messy])
+    if decimal_comma.any():
+        # to_numeric reads "1.250" as 1.25; with these currencies it is 1250
+        dotted = decimal_comma & ~messy & raw_price.str.fullmatch(r"\d{1,3}(?:\.\d{3})+")
+        if dotted.any(): price[dotted] = parse_number(raw_price[dotted], True)
+    df['Price'] = price
+
+    for field, ar_field in (('Dish', 'Dish (AR)'), ('Description', 'Description (AR)')):
+        missing = df[ar_field] == ""
+        if missing.any():
+            latin, arabic = split_arabic(df.loc[missing, field])
+            df.loc[missing, field] = latin
+            df.loc[missing, ar_field] = arabic
+
+    return df.drop_duplicates(subset=DEDUPE_FIELDS, ignore_index=True)
+
+def normalize_records(rows):
+    # Same records, normalized; missing prices become None rather than NaN.
+    # Built from plain object arrays: DataFrame.to_dict is several times slower.
+    if not rows: return rows
+    df = normalize_frame(pd.DataFrame(rows))
+    fields = list(df.columns)
+    columns = [df[field].to_numpy(dtype=object, na_value=None) for field in fields]
+    return [dict(zip(fields, values)) for values in zip(*columns)]
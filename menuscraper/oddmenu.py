@@ -0,0 +1,13 @@
+from .platforms import ADAPTERS, PlatformAdapter, register
+from .crawler import crawl
+
+# --- SCRAPER: ODDMENU ---
+# Tabs on the landing page each list category links, and every category is its own
+# page; all of it is declared in SITES["OddMenu"], so the adapter adds nothing.
+@register("OddMenu")
+class OddMenuAdapter(PlatformAdapter):
+    pass
+
+def run_scrape_oddmenu(url, progress_callback, image_root, pool=None, images=None, state=None, policy=None):
+    return crawl(ADAPTERS["OddMenu"], url, progress_callback, image_root, pool=pool, images=images, state=state,
+                 policy=policy)
@@ -0,0 +1,222 @@
+import os
+import csv
+import json
+import zipfile
+import threading
+import importlib.util
+import pandas as pd
+
+from .utils import clean_filename
+
+# --- STREAMING ZIP ---
+# The download archive is built while the batch runs: every CSV and image is added as
+# soon as it is written, so there is no make_archive pass over the folder at the end.
+STORED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.parquet')   # Already compressed
+
+class ArchiveWriter:
+    # Thread-safe; image download workers add their files directly. Zip entries can't be
+    # replaced, so a name added twice keeps its first version.
+    def __init__(self, zip_path, root):
+        self.path = zip_path
+        self.root = root
+        self.stats = {'files': 0, 'bytes': 0}
+        self._names = set()
+        self._lock = threading.Lock()
+        self._zip = zipfile.ZipFile(zip_path, 'w', allowZip64=True)
+
+    def arcname(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, '/')
+
+    def add(self, path, arcname=None):
+        arcname = arcname or self.arcname(path)
+        compress = zipfile.ZIP_STORED if arcname.lower().endswith(STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+        with self._lock:
+            if self._zip is None or arcname in self._names: return
+            self._zip.write(path, arcname, compress_type=compress)
+            self._names.add(arcname)
+            self.stats['files'] += 1
+            self.stats['bytes'] += os.path.getsize(path)
+
+    def add_tree(self, folder, exclude=(), skip_links=False):
+        # `exclude` holds file or folder paths to leave out. With skip_links, a hardlink to
+        # a file already added (how deduplicated images are stored) is left out as well;
+        # returns those as [(path, first path)].
+        exclude = {os.path.normpath(p) for p in exclude}
+        first_paths = {}
+        linked = []
+        for dirpath, dirnames, filenames in os.walk(folder):
+            dirnames.sort()
+            dirnames[:] = [d for d in dirnames if os.path.normpath(os.path.join(dirpath, d)) not in exclude]
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                if os.path.normpath(path) in exclude or name.endswith(".part"): continue
+                if skip_links:
+                    st = os.stat(path)
+                    if st.st_nlink > 1:
+                        first = first_paths.setdefault((st.st_dev, st.st_ino), path)
+                        if first != path:
+                            linked.append((path, first))
+                            continue
+                self.add(path)
+        return linked
+
+    def close(self):
+        with self._lock:
+            if self._zip is None: return
+            self._zip.close()
+            self._zip = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def save_individual_csv(data_list, folder_path, restaurant_name, platform):
+    if not data_list: return
+
+    df = pd.DataFrame(data_list)  
+    export_df = pd.DataFrame()
+    export_df['Type'] = ["Product"] * len(df)
+    export_df['Category'] = df['Category']
+    export_df['Name (EN)'] = df['Dish']
+    export_df['Name (AR)'] = df.get('Dish (AR)', "")
+    export_df['Description (EN)'] = df['Description']
+    export_df['Description (AR)'] = df.get('Description (AR)', "")
+    export_df['Price'] = df['Price']
+    export_df['Currency'] = df['Currency']
+    export_df['Status'] = ["Enabled"] * len(df)
+    export_df['Image URL'] = df['Image URL']
+
+    safe_name = clean_filename(restaurant_name)
+    # Filename format: RestaurantName_Platform.csv
+    filename = f"{safe_name}_{platform}.csv"
+    save_path = os.path.join(folder_path, filename)
+
+    export_df.to_csv(save_path, index=False, encoding='utf-8-sig')
+    return filename
+
+# --- STREAMING SINKS ---
+# Rows are appended to the combined outputs as each restaurant finishes, so a crash
+# late in a batch keeps everything scraped before it and memory stays flat.
+RECORD_FIELDS = ['Restaurant', 'Tab', 'Category', 'Dish', 'Description', 'Dish (AR)', 'Description (AR)', 'Price', 'Currency',
+                 'Image URL', 'Source', 'Platform']
+MASTER_NAME = "All_menus_in_one"
+OUTPUT_FORMATS = ("csv", "jsonl", "parquet")
+
+def parquet_available():
+    return bool(importlib.util.find_spec("pyarrow") or importlib.util.find_spec("fastparquet"))
+
+def open_for_append(path, position, **kwargs):
+    # Resuming: reopens a sink file cut back to `position` (its size at the last
+    # checkpoint), dropping rows from a restaurant that never completed. Returns None
+    # when there is nothing usable to resume from.
+    if not position or not os.path.exists(path) or os.path.getsize(path) < position: return None
+    f = open(path, 'a', **kwargs)
+    f.truncate(position)
+    return f
+
+class CsvSink:
+    def __init__(self, path, position=None, fields=RECORD_FIELDS):
+        self.path = path
+        self._file = open_for_append(path, position, newline='', encoding='utf-8-sig')
+        resumed = self._file is not None
+        if not resumed: self._file = open(path, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.DictWriter(self._file, fieldnames=fields, extrasaction='ignore', lineterminator=os.linesep)
+        if not resumed: self._writer.writeheader()
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def position(self):
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+class JsonlSink:
+    def __init__(self, path, position=None):
+        self.path = path
+        self._file = open_for_append(path, position, encoding='utf-8') or open(path, 'w', encoding='utf-8')
+
+    def write(self, rows):
+        for row in rows:
+            self._file.write(json.dumps({k: row.get(k) for k in RECORD_FIELDS}, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def position(self):
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+class ParquetSink:
+    # A Parquet file is unreadable until its footer is written, so every restaurant gets
+    # its own part file; pd.read_parquet(folder) reads the folder as one table.
+    def __init__(self, path, position=None):
+        if not parquet_available():
+            raise ValueError("Parquet output needs pyarrow or fastparquet installed.")
+        self.path = path
+        self._parts = position or 0
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            # Parts past the checkpoint (or from an earlier run) are dropped
+            if name.startswith("part-") and int(name[5:10]) >= self._parts:
+                os.remove(os.path.join(path, name))
+
+    def write(self, rows):
+        # Prices stay numeric (see normalize.py) so every part has the same schema
+        df = pd.DataFrame(rows, columns=RECORD_FIELDS)
+        df = df.astype({field: str for field in RECORD_FIELDS if field != 'Price'}).astype({'Price': float})
+        df.to_parquet(os.path.join(self.path, f"part-{self._parts:05d}.parquet"), index=False)
+        self._parts += 1
+
+    def position(self):
+        return self._parts
+
+    def close(self):
+        pass
+
+SINKS = {
+    "csv": (CsvSink, ".csv"),
+    "jsonl": (JsonlSink, ".jsonl"),
+    "parquet": (ParquetSink, ".parquet"),
+}
+
+class RowWriter:
+    # Fans each restaurant's rows out to the master CSV plus any extra formats.
+    # `resume_from` is a positions() result saved earlier; those sinks continue from it.
+    def __init__(self, folder_path, formats=("csv",), resume_from=None):
+        self.rows = 0
+        self.paths = {}
+        self._sinks = {}
+        resume_from = resume_from or {}
+        try:
+            for fmt in dict.fromkeys(("csv",) + tuple(formats)):
+                sink_cls, ext = SINKS[fmt]
+                sink = sink_cls(os.path.join(folder_path, MASTER_NAME + ext), position=resume_from.get(fmt))
+                self._sinks[fmt] = sink
+                self.paths[fmt] = sink.path
+        except Exception:
+            self.close()
+            raise
+
+    def write(self, rows):
+        if not rows: return
+        for sink in self._sinks.values():
+            sink.write(rows)
+        self.rows += len(rows)
+
+    def positions(self):
+        return {fmt: sink.position() for fmt, sink in self._sinks.items()}
+
+    def close(self):
+        for sink in self._sinks.values():
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,110 @@
+import importlib
+from fnmatch import fnmatchcase
+from urllib.parse import urlparse
+
+from .config import SITES
+from .crawler import extract_items
+from .readiness import wait_for_content_change
+from .timing import span
+
+# --- PLATFORM ADAPTERS ---
+# A platform is its SITES config plus an adapter. The shared crawler (crawler.py)
+# drives every adapter the same way: discover() the sections, extract() the dishes,
+# normalize() each one into a record. The defaults below cover a site that is fully
+# described by its config; a platform module subclasses PlatformAdapter only where its
+# pages need more (see finedine.py), and registers it under its SITES name.
+PLATFORM_MODULES = ["oddmenu", "finedine"]
+ADAPTERS = {}
+
+def register(name):
+    def decorator(cls):
+        ADAPTERS[name] = cls(name, SITES[name])
+        return cls
+    return decorator
+
+def adapter_for(url):
+    # The registered adapter whose `hosts` patterns match the URL's host, or None
+    for adapter in ADAPTERS.values():
+        if adapter.matches(url): return adapter
+    return None
+
+class PlatformAdapter:
+    def __init__(self, name, config):
+        self.name = name
+        self.config = config
+
+    def matches(self, url):
+        # Pasted links often come without a scheme ("app.oddmenu.com/...")
+        host = urlparse(url.strip() if "//" in url else f"//{url.strip()}").hostname or ""
+        return any(fnmatchcase(host, pattern) for pattern in self.config.get('hosts', ()))
+
+    def context_options(self):
+        return {'user_agent': self.config['user_agent']} if self.config.get('user_agent') else {}
+
+    def title_text(self, page):
+        # Text of the configured `title` element, or None
+        try:
+            title = page.locator(self.config['title']) if self.config.get('title') else None
+            if title and title.count() > 0: return title.first.inner_text().strip() or None
+        except Exception:
+            pass
+        return None
+
+    def restaurant_name(self, page, url):
+        name = self.title_text(page)
+        if name: return name
+        try:
+            return page.title().split('|')[0].strip()
+        except Exception:
+            return url.split('/')[-1]
+
+    def discover(self, page, progress_callback):
+        # Returns ([{'tab', 'name', 'href'}], waited_ms), or (None, 0) when the menu is
+        # on the landing page. Every tab is clicked once and its section links are
+        # collected, so sections can then be visited directly without reloading the
+        # landing page in between.
+        sections = self.config.get('sections')
+        if not sections: return None, 0
+        tabs = self.config.get('tabs')
+        if not tabs:
+            found = extract_items(page, sections)
+            return [dict(section, tab=self.config.get('tab', "Menu")) for section in found if section['href']], 0
+
+        plan = []
+        waited_ms = 0
+        signature = None
+        tab_names = [tab['name'] for tab in extract_items(page, {'item': tabs, 'fields': {'name': {}}})]
+        for t_idx, tab_name in enumerate(tab_names):
+            progress_callback(f"--> Processing Tab: {tab_name}")
+            with span("navigate"):
+                page.locator(tabs).nth(t_idx).click()
+            # The first tab is usually already active, so only later tabs must differ from the last render
+            with span("wait"):
+                signature, elapsed = wait_for_content_change(page, sections['item'], previous=signature if t_idx else None)
+            waited_ms += elapsed
+            for section in extract_items(page, sections):
+                if section['href']: plan.append(dict(section, tab=tab_name))
+        return plan, waited_ms
+
+    def section_name(self, text):
+        return text.strip()
+
+    def extract(self, page):
+        return extract_items(page, self.config['items'])
+
+    def normalize(self, item, restaurant, tab, category, url):
+        return {
+            'Restaurant': restaurant,
+            'Tab': tab,
+            'Category': category,
+            'Dish': item.get('name', ''),
+            'Description': item.get('description', ''),
+            'Price': item.get('price', ''),
+            'Currency': item.get('currency', ''),
+            'Image URL': item.get('img', ''),
+            'Source': url,
+            'Platform': self.name,
+        }
+
+# Imported last: each platform module registers its adapter with the classes above
+for module in PLATFORM_MODULES: importlib.import_module(f".{module}", __package__)
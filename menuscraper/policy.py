@@ -0,0 +1,144 @@
+import time
+import random
+import threading
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from .config import (
+    PAGE_RETRIES, RETRY_BACKOFF, RETRY_BACKOFF_MAX, HOST_RATE, HOST_BURST, IMAGE_HOST_RATE, BREAKER_FAILURES,
+    BREAKER_COOLDOWN, TIMEOUT_FACTOR, MIN_TIMEOUT_MS,
+)
+from .timing import percentile
+
+# --- REQUEST POLICY ---
+# One place that decides how hard a host may be hit and what happens when it fails:
+#   - token bucket per host (HOST_RATE requests/s, HOST_BURST burst); image fetches
+#     draw from a separate bucket refilled at IMAGE_HOST_RATE
+#   - exponential backoff with full jitter between retries
+#   - timeouts derived from the host's observed p95 latency (per kind of request,
+#     since a full page load, a plain HTML fetch and an image fetch take very
+#     different times)
+#   - a circuit breaker that pauses a host after BREAKER_FAILURES consecutive failures
+#     and lets a single trial request through after BREAKER_COOLDOWN seconds
+# Anything skipped, retried or served stale is recorded as an issue so it ends up in
+# Issues.csv instead of disappearing.
+ISSUE_FIELDS = ['Restaurant', 'Issue', 'Stage', 'Target', 'Detail']
+LATENCY_SAMPLES = 50          # Recent latencies kept per host and kind
+MIN_LATENCY_SAMPLES = 5       # Below this the call's default timeout is used
+
+class CircuitOpenError(Exception):
+    pass
+
+class RequestPolicy:
+    def __init__(self, rate=HOST_RATE, burst=HOST_BURST, image_rate=IMAGE_HOST_RATE, retries=PAGE_RETRIES,
+                 backoff=RETRY_BACKOFF, max_backoff=RETRY_BACKOFF_MAX, breaker_failures=BREAKER_FAILURES,
+                 breaker_cooldown=BREAKER_COOLDOWN):
+        self.rate = rate
+        self.image_rate = image_rate
+        self.burst = max(1, burst)
+        self.retries = retries
+        self.backoff_base = backoff
+        self.max_backoff = max_backoff
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self.stats = {'throttled_s': 0.0, 'retries': 0, 'short_circuited': 0, 'breaker_opened': 0}
+        self._hosts = {}
+        self._buckets = {}
+        self._latencies = {}
+        self._issues = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url):
+        return urlparse(url).netloc.lower()
+
+    def _host_state(self, host):
+        # Called with the lock held
+        if host not in self._hosts:
+            self._hosts[host] = {'failures': 0, 'opened_at': None, 'probing': False}
+        return self._hosts[host]
+
+    def acquire(self, url, kind="page"):
+        # Blocks until the host's bucket has a token
+        key = (self.host(url), kind == "image")
+        rate = self.image_rate if kind == "image" else self.rate
+        waited = 0.0
+        while True:
+            with self._lock:
+                b = self._buckets.setdefault(key, {'tokens': float(self.burst), 'refilled': time.monotonic()})
+                now = time.monotonic()
+                b['tokens'] = min(self.burst, b['tokens'] + (now - b['refilled']) * rate)
+                b['refilled'] = now
+                if b['tokens'] >= 1:
+                    b['tokens'] -= 1
+                    self.stats['throttled_s'] += waited
+                    return
+                delay = (1 - b['tokens']) / rate
+            time.sleep(delay)
+            waited += delay
+
+    def check(self, url):
+        # Raises CircuitOpenError while the host is paused; after the cooldown one
+        # caller at a time is let through to probe it
+        with self._lock:
+            h = self._host_state(self.host(url))
+            if h['opened_at'] is None: return
+            if time.monotonic() - h['opened_at'] >= self.breaker_cooldown and not h['probing']:
+                h['probing'] = True
+                return
+            self.stats['short_circuited'] += 1
+        raise CircuitOpenError(f"{self.host(url)} is failing; paused for {self.breaker_cooldown}s")
+
+    def success(self, url, kind, latency_ms):
+        host = self.host(url)
+        with self._lock:
+            h = self._host_state(host)
+            h.update(failures=0, opened_at=None, probing=False)
+            self._latencies.setdefault((host, kind), deque(maxlen=LATENCY_SAMPLES)).append(latency_ms)
+
+    def failure(self, url):
+        with self._lock:
+            h = self._host_state(self.host(url))
+            h['failures'] += 1
+            # Trip on too many failures in a row, or re-trip when the trial request fails
+            if h['probing'] or (h['opened_at'] is None and h['failures'] >= self.breaker_failures):
+                if h['opened_at'] is None: self.stats['breaker_opened'] += 1
+                h.update(opened_at=time.monotonic(), probing=False)
+
+    def timeout_ms(self, url, kind, default_ms):
+        with self._lock:
+            samples = list(self._latencies.get((self.host(url), kind), ()))
+        if len(samples) < MIN_LATENCY_SAMPLES: return default_ms
+        p95 = percentile(samples, 95)
+        return int(min(default_ms, max(MIN_TIMEOUT_MS, p95 * TIMEOUT_FACTOR)))
+
+    def backoff(self, attempt):
+        # Seconds to sleep before retry number `attempt` (0-based), with full jitter
+        with self._lock: self.stats['retries'] += 1
+        return random.uniform(0, min(self.max_backoff, self.backoff_base * (2 ** attempt)))
+
+    @contextmanager
+    def request(self, url, kind, default_timeout_ms):
+        # Wraps one request: circuit check, rate limit, then latency/failure bookkeeping.
+        # Yields the timeout to use, in milliseconds.
+        self.check(url)
+        self.acquire(url, kind)
+        started = time.monotonic()
+        try:
+            yield self.timeout_ms(url, kind, default_timeout_ms)
+        except Exception:
+            self.failure(url)
+            raise
+        self.success(url, kind, (time.monotonic() - started) * 1000)
+
+    def note(self, restaurant, issue, stage, target, detail=""):
+        # issue: 'retried', 'skipped', 'failed' or 'stale'
+        with self._lock:
+            self._issues.append({'Restaurant': restaurant, 'Issue': issue, 'Stage': stage,
+                                 'Target': target, 'Detail': detail})
+
+    def drain_issues(self):
+        with self._lock:
+            issues, self._issues = self._issues, []
+        return issues
@@ -0,0 +1,75 @@
+import time
+
+from .config import READY_BUDGET_MS, READY_TAB_BUDGET_MS, READY_SETTLE_MS
+
+# --- READINESS WAITS ---
+# Instead of fixed sleeps, pages are watched with a MutationObserver inside the
+# browser: a wait ends as soon as the DOM has been quiet for READY_SETTLE_MS, so a
+# fully rendered menu costs a few hundred ms while a long lazy-loaded one keeps
+# scrolling until the item count stops growing (bounded by a budget).
+_QUIET_JS = """
+    const quiet = (ms, deadline) => new Promise(resolve => {
+        let timer = null;
+        const observer = new MutationObserver(() => { if (performance.now() < deadline) arm(); });
+        const done = () => { observer.disconnect(); resolve(); };
+        const arm = () => {
+            clearTimeout(timer);
+            timer = setTimeout(done, Math.max(0, Math.min(ms, deadline - performance.now())));
+        };
+        observer.observe(document.body, {childList: true, subtree: true});
+        arm();
+    });
+"""
+
+SCROLL_UNTIL_STABLE_JS = """async ({selector, budget, settle}) => {""" + _QUIET_JS + """
+    const started = performance.now();
+    const deadline = started + budget;
+    const count = () => document.querySelectorAll(selector).length;
+    let last = count();
+    while (performance.now() < deadline) {
+        window.scrollTo(0, document.body.scrollHeight);
+        await quiet(settle, deadline);
+        const now = count();
+        if (now === last) break;
+        last = now;
+    }
+    window.scrollTo(0, 0);
+    return {count: last, elapsed: Math.round(performance.now() - started)};
+}"""
+
+WAIT_FOR_CHANGE_JS = """async ({selector, previous, budget, settle}) => {""" + _QUIET_JS + """
+    const started = performance.now();
+    const deadline = started + budget;
+    const signature = () => Array.from(document.querySelectorAll(selector), el => el.textContent.trim()).join('|');
+    let sig = signature();
+    while ((!sig || sig === previous) && performance.now() < deadline) {
+        await quiet(50, deadline);
+        sig = signature();
+    }
+    await quiet(settle, deadline);
+    return {signature: signature(), elapsed: Math.round(performance.now() - started)};
+}"""
+
+def _evaluate_wait(page, script, args):
+    started = time.monotonic()
+    try:
+        return page.evaluate(script, args)
+    except Exception:
+        # A navigation mid-wait destroys the execution context; settle for the load event
+        page.wait_for_load_state("domcontentloaded")
+        return {'elapsed': int((time.monotonic() - started) * 1000)}
+
+def scroll_until_stable(page, selector, budget_ms=READY_BUDGET_MS, settle_ms=READY_SETTLE_MS):
+    # Returns (item_count, elapsed_ms)
+    result = _evaluate_wait(page, SCROLL_UNTIL_STABLE_JS, {'selector': selector, 'budget': budget_ms, 'settle': settle_ms})
+    return result.get('count'), result['elapsed']
+
+def wait_for_content_change(page, selector, previous=None, budget_ms=READY_TAB_BUDGET_MS, settle_ms=READY_SETTLE_MS):
+    # Waits until `selector`'s text differs from `previous` (if given) and the DOM
+    # settles. Returns (signature, elapsed_ms); pass the signature to the next call.
+    result = _evaluate_wait(page, WAIT_FOR_CHANGE_JS, {'selector': selector, 'previous': previous, 'budget': budget_ms, 'settle': settle_ms})
+    return result.get('signature'), result['elapsed']
+
+def report_wait_savings(progress_callback, waited_ms, fixed_ms):
+    saved = max(0, fixed_ms - waited_ms)
+    progress_callback(f"⏱️ Readiness waits: {waited_ms / 1000:.1f}s (fixed sleeps would take {fixed_ms / 1000:.1f}s, saved {saved / 1000:.1f}s)")
@@ -0,0 +1,119 @@
+import time
+import threading
+import queue
+
+from .config import MAX_WORKERS, PLATFORM_CONCURRENCY, FAST_PATH
+from .browser import BrowserPool
+from .images import borrow_downloader
+from .timing import track
+from .fastpath import scrape_fast_path
+from .platforms import ADAPTERS, adapter_for
+from .crawler import crawl
+
+# --- CONCURRENT SCHEDULER ---
+def detect_platform(url):
+    adapter = adapter_for(url)
+    return adapter.name if adapter else None
+
+def scrape_restaurant(url, platform, progress_callback, image_root, pool=None, images=None, fast_path=None, state=None,
+                      policy=None):
+    # Returns (records, changes); changes is the diff against the previous snapshot,
+    # or None when there is no state store or no earlier snapshot.
+    fast_path = FAST_PATH if fast_path is None else fast_path
+    with borrow_downloader(images) as images:
+        data = []
+        if fast_path.get(platform):
+            data = scrape_fast_path(url, platform, progress_callback, image_root, images, state=state, policy=policy)
+            if not data: progress_callback("Fast path unavailable, falling back to the browser")
+        if not data:
+            data = crawl(ADAPTERS[platform], url, progress_callback, image_root, pool=pool, images=images, state=state,
+                         policy=policy)
+
+    changes = None
+    if state and data:
+        changes = state.record(url, data)
+        if changes is None:
+            progress_callback("📸 First snapshot stored for change tracking")
+        else:
+            counts = {kind: sum(1 for c in changes if c['Change'] == kind) for kind in ('added', 'removed', 'repriced')}
+            progress_callback(f"🔁 Changes since last run: {counts['added']} added, {counts['removed']} removed, {counts['repriced']} repriced")
+    return data, changes
+
+def scrape_batch(jobs, image_root, workers=MAX_WORKERS, platform_limits=None, images=None, blocker=None, fast_path=None, state=None,
+                 recorder=None, policy=None):
+    # jobs: list of (index, url, platform). Runs up to `workers` restaurants at once,
+    # never more than platform_limits[platform] per platform, and yields events as
+    # they happen (completion order, not input order):
+    #   ('start', index, url, platform)
+    #   ('log', index, url, message)
+    #   ('done', index, url, platform, data, changes)
+    # Playwright's sync API is bound to the thread that started it, so every worker
+    # owns its own BrowserPool; the caller's thread (UI or CLI) only consumes events.
+    # Image downloads go to the shared `images` pipeline and may still be in flight
+    # when the last 'done' event is yielded; close() it before packaging.
+    # With a SpanRecorder, each restaurant's stages and total time are recorded under its URL.
+    # Page loads go through `policy` (the image pipeline's own when not given).
+    limits = dict(PLATFORM_CONCURRENCY if platform_limits is None else platform_limits)
+    pending = list(jobs)
+    active = {}
+    slots = threading.Condition()
+    events = queue.Queue()
+
+    def take_job():
+        with slots:
+            while pending:
+                for i, job in enumerate(pending):
+                    platform = job[2]
+                    if active.get(platform, 0) < max(1, limits.get(platform, workers)):
+                        active[platform] = active.get(platform, 0) + 1
+                        return pending.pop(i)
+                slots.wait()
+            return None
+
+    def release(platform):
+        with slots:
+            active[platform] -= 1
+            slots.notify_all()
+
+    def worker():
+        pool = BrowserPool(size=1, blocker=blocker)
+        try:
+            while True:
+                job = take_job()
+                if job is None: return
+                index, url, platform = job
+                events.put(('start', index, url, platform))
+                log = lambda msg, index=index, url=url: events.put(('log', index, url, msg))
+                data, changes = [], None
+                started = time.monotonic()
+                try:
+                    with track(recorder, url):
+                        if platform in ADAPTERS:
+                            data, changes = scrape_restaurant(url, platform, log, image_root, pool=pool, images=images,
+                                                              fast_path=fast_path, state=state, policy=policy)
+                        else:
+                            log("Unknown Platform URL")
+                except Exception as e:
+                    log(f"Error scraping {url}: {e}")
+                finally:
+                    if recorder: recorder.restaurant_done(url, platform, (time.monotonic() - started) * 1000, len(data))
+                    release(platform)
+                    events.put(('done', index, url, platform, data, changes))
+        finally:
+            pool.close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, min(workers, len(jobs))))]
+    for t in threads: t.start()
+
+    remaining = len(jobs)
+    try:
+        while remaining:
+            event = events.get()
+            if event[0] == 'done': remaining -= 1
+            yield event
+    finally:
+        # If the consumer stops early (e.g. Streamlit rerun), let workers drain out
+        with slots:
+            pending.clear()
+            slots.notify_all()
+    for t in threads: t.join()
@@ -0,0 +1,112 @@
+import os
+import time
+import json
+import hashlib
+import sqlite3
+import threading
+
+from .config import STATE_DB
+from .embedded import fetch_html, embedded_json_blobs
+
+# --- INCREMENTAL STATE ---
+# The last snapshot of every restaurant/category is kept in SQLite. Before a category
+# is extracted we compare a cheap fingerprint (a hash of the page's embedded menu JSON
+# or of the extracted items) against the stored one; unchanged categories reuse the
+# stored rows and their cached images without revalidation. After each restaurant
+# the new rows are diffed against the previous snapshot (added/removed/repriced).
+def fingerprint(payload):
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+def http_fingerprint(url, policy):
+    # Hash of the JSON embedded in the raw HTML, or None if the page has none. A
+    # failed fetch is not an issue: the caller just loads the page in the browser.
+    page_html = fetch_html(url, policy, report=False)
+    blobs = embedded_json_blobs(page_html) if page_html else []
+    return fingerprint(blobs) if blobs else None
+
+CHANGE_FIELDS = ['Restaurant', 'Source', 'Change', 'Tab', 'Category', 'Dish', 'Old Price', 'New Price', 'Currency']
+
+def diff_menus(old_rows, new_rows):
+    def index(rows):
+        return {(r['Tab'], r['Category'], r['Dish']): r for r in rows}
+    old, new = index(old_rows), index(new_rows)
+    changes = []
+    for key, row in new.items():
+        if key not in old:
+            changes.append(('added', row, None))
+        elif str(old[key]['Price']) != str(row['Price']):
+            changes.append(('repriced', row, old[key]))
+    for key, row in old.items():
+        if key not in new:
+            changes.append(('removed', row, None))
+    return [{
+        'Restaurant': row['Restaurant'],
+        'Source': row['Source'],
+        'Change': change,
+        'Tab': row['Tab'],
+        'Category': row['Category'],
+        'Dish': row['Dish'],
+        'Old Price': previous['Price'] if previous else (row['Price'] if change == 'removed' else ""),
+        'New Price': "" if change == 'removed' else row['Price'],
+        'Currency': row['Currency'],
+    } for change, row, previous in changes]
+
+class SnapshotStore:
+    def __init__(self, path=STATE_DB):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS categories ("
+            "source TEXT, tab TEXT, category TEXT, fingerprint TEXT, rows TEXT, scraped_at REAL, "
+            "PRIMARY KEY (source, tab, category))"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS restaurants (source TEXT PRIMARY KEY, fingerprint TEXT, scraped_at REAL)")
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def category(self, source, tab, category):
+        # Returns (fingerprint, rows) from the last snapshot, or (None, [])
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fingerprint, rows FROM categories WHERE source = ? AND tab = ? AND category = ?",
+                (source, tab, category)
+            ).fetchone()
+        return (row[0], json.loads(row[1])) if row else (None, [])
+
+    def restaurant_fingerprint(self, source):
+        with self._lock:
+            row = self._db.execute("SELECT fingerprint FROM restaurants WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else None
+
+    def note_fingerprint(self, source, tab=None, category=None, value=None):
+        # Fingerprints seen during a scrape; saved together with the rows by record()
+        with self._lock:
+            self._pending[(source, tab, category)] = value
+
+    def record(self, source, rows):
+        # Replaces the restaurant's snapshot with `rows`. Returns the diff against the
+        # previous snapshot, or None when there was none.
+        grouped = {}
+        for row in rows:
+            grouped.setdefault((row['Tab'], row['Category']), []).append(row)
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT rows FROM categories WHERE source = ?", (source,)).fetchall()
+            old_rows = [r for (blob,) in old for r in json.loads(blob)]
+            self._db.execute("DELETE FROM categories WHERE source = ?", (source,))
+            for (tab, category), cat_rows in grouped.items():
+                fp = self._pending.pop((source, tab, category), None) or fingerprint(cat_rows)
+                self._db.execute(
+                    "INSERT INTO categories VALUES (?, ?, ?, ?, ?, ?)",
+                    (source, tab, category, fp, json.dumps(cat_rows, ensure_ascii=False), now)
+                )
+            restaurant_fp = self._pending.pop((source, None, None), None)
+            self._db.execute("INSERT OR REPLACE INTO restaurants VALUES (?, ?, ?)", (source, restaurant_fp, now))
+            self._db.commit()
+            for key in [k for k in self._pending if k[0] == source]: del self._pending[key]
+        return diff_menus(old_rows, rows) if old else None
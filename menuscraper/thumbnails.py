@@ -0,0 +1,110 @@
+import os
+import queue
+import shutil
+import hashlib
+import tempfile
+import threading
+import importlib.util
+
+from .config import THUMBNAIL_SIZE, THUMBNAIL_QUALITY, THUMBNAIL_WORKERS
+from .timing import span
+
+# --- THUMBNAILS ---
+# Optional stage after the image download: every stored image also gets a resized
+# copy (longest side THUMBNAIL_SIZE px) as WebP or JPEG under <out>/Thumbnails/, at the
+# same relative path as the original. Needs Pillow, which is imported only when used.
+THUMBNAIL_DIR = "Thumbnails"
+THUMBNAIL_FORMATS = {"webp": ".webp", "jpeg": ".jpg"}
+
+def pillow_available():
+    return importlib.util.find_spec("PIL") is not None
+
+def check_thumbnail_format(fmt):
+    if fmt not in THUMBNAIL_FORMATS:
+        raise ValueError(f"Unknown thumbnail format {fmt!r}; use one of {', '.join(THUMBNAIL_FORMATS)}.")
+    if not pillow_available():
+        raise ValueError("Thumbnails need Pillow: pip install pillow")
+
+def make_thumbnail(src_path, dest_path, fmt="webp", size=THUMBNAIL_SIZE, quality=THUMBNAIL_QUALITY):
+    # Returns the size of the written thumbnail in bytes
+    from PIL import Image
+    with Image.open(src_path) as img:
+        img.thumbnail((size, size))
+        if img.mode not in ("RGB", "L") and (fmt == "jpeg" or img.mode != "RGBA"): img = img.convert("RGB")
+        img.save(dest_path, format=fmt.upper(), quality=quality)
+    return os.path.getsize(dest_path)
+
+class Thumbnailer:
+    # Fed by the ImageDownloader once an image is saved. With cleanup=True the source
+    # is a spooled temp file that is deleted once its thumbnail is made. Like the
+    # downloader, stage=False keeps thumbnails out of the folder and only in the archive.
+    def __init__(self, image_root, fmt="webp", size=THUMBNAIL_SIZE, workers=THUMBNAIL_WORKERS, archive=None, stage=True):
+        check_thumbnail_format(fmt)
+        self.image_root = image_root
+        self.root = os.path.join(image_root, THUMBNAIL_DIR)
+        self.fmt = fmt
+        self.size = size
+        self.archive = archive
+        self.stage = stage or archive is None
+        self._spool = None if self.stage else tempfile.mkdtemp(prefix="menu-thumbnails-")
+        self.stats = {'made': 0, 'failed': 0, 'bytes': 0}
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(max(1, workers))]
+        for t in self._threads: t.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def path_for(self, save_path):
+        rel = os.path.relpath(save_path, self.image_root)
+        return os.path.join(self.root, os.path.splitext(rel)[0] + THUMBNAIL_FORMATS[self.fmt])
+
+    def submit(self, src_path, save_path, cleanup=False, active=None):
+        self._jobs.put((src_path, save_path, cleanup, active))
+
+    def close(self):
+        # Finishes everything queued; safe to call twice
+        if not any(t.is_alive() for t in self._threads): return
+        for _ in self._threads: self._jobs.put(None)
+        for t in self._threads: t.join()
+        if self._spool: shutil.rmtree(self._spool, ignore_errors=True)
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None: return
+                src_path, save_path, cleanup, active = job
+                with span("thumbnail", active=active) as stage:
+                    self._make(src_path, save_path, stage)
+                if cleanup: os.remove(src_path)
+            except OSError:
+                pass
+            finally:
+                self._jobs.task_done()
+
+    def _make(self, src_path, save_path, stage):
+        dest = self.path_for(save_path)
+        if self.stage:
+            target = dest
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+        else:
+            target = os.path.join(self._spool, hashlib.sha1(dest.encode()).hexdigest() + THUMBNAIL_FORMATS[self.fmt])
+        try:
+            size = make_thumbnail(src_path, target, self.fmt, self.size)
+            if self.archive:
+                self.archive.add(target, self.archive.arcname(dest))
+                if not self.stage: os.remove(target)
+        except Exception:
+            # Not a decodable image (or a truncated one); the original is still saved
+            stage['ok'] = False
+            with self._lock: self.stats['failed'] += 1
+            return
+        stage['bytes'] = size
+        with self._lock:
+            self.stats['made'] += 1
+            self.stats['bytes'] += size
@@ -0,0 +1,135 @@
+import os
+import csv
+import math
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+# --- TIMING SPANS ---
+# Scraping code wraps each stage in `with span("navigate"):`. The span is recorded by
+# the SpanRecorder bound to the current thread with track(), tagged with the restaurant
+# being scraped; on a thread with nothing bound it only runs the block. Image downloads
+# happen on other threads, so the downloader captures current() when a job is queued.
+STAGES = ("launch", "fetch", "navigate", "wait", "extract", "image", "thumbnail", "normalize", "write")
+SPAN_FIELDS = ['Restaurant', 'Stage', 'Start s', 'ms', 'Items', 'Bytes', 'Retries', 'OK']
+TIMING_FILES = ("timings.json", "timings.csv")
+_local = threading.local()
+
+def percentile(values, pct):
+    # Nearest-rank percentile of an unsorted list
+    if not values: return 0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+class SpanRecorder:
+    def __init__(self):
+        self.spans = []
+        self.restaurants = {}
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def add(self, stage, restaurant, ms, items=0, bytes=0, retries=0, ok=True):
+        span = {'Restaurant': restaurant, 'Stage': stage, 'Start s': round(time.monotonic() - self._started - ms / 1000, 3),
+                'ms': round(ms, 1), 'Items': items, 'Bytes': bytes, 'Retries': retries, 'OK': ok}
+        with self._lock:
+            self.spans.append(span)
+
+    def restaurant_done(self, restaurant, platform, ms, items):
+        with self._lock:
+            self.restaurants[restaurant] = {'platform': platform, 'ms': ms, 'items': items}
+
+    def summary(self):
+        with self._lock:
+            spans = list(self.spans)
+            restaurants = dict(self.restaurants)
+        wall_s = time.monotonic() - self._started
+
+        stages = []
+        for stage in STAGES + tuple(sorted({s['Stage'] for s in spans} - set(STAGES))):
+            picked = [s for s in spans if s['Stage'] == stage]
+            if not picked: continue
+            durations = [s['ms'] for s in picked]
+            stages.append({
+                'Stage': stage,
+                'Count': len(picked),
+                'Total s': round(sum(durations) / 1000, 2),
+                'p50 ms': percentile(durations, 50),
+                'p95 ms': percentile(durations, 95),
+                'Max ms': max(durations),
+                'Items': sum(s['Items'] for s in picked),
+                'Bytes': sum(s['Bytes'] for s in picked),
+                'Retries': sum(s['Retries'] for s in picked),
+                'Errors': sum(1 for s in picked if not s['OK']),
+            })
+
+        per_restaurant = []
+        for restaurant, info in restaurants.items():
+            picked = [s for s in spans if s['Restaurant'] == restaurant]
+            seconds = info['ms'] / 1000
+            row = {
+                'Restaurant': restaurant,
+                'Platform': info['platform'],
+                'Total s': round(seconds, 2),
+                'Items': info['items'],
+                'Items/s': round(info['items'] / seconds, 1) if seconds else 0,
+                'Image bytes': sum(s['Bytes'] for s in picked if s['Stage'] == 'image'),
+                'Retries': sum(s['Retries'] for s in picked),
+            }
+            for stage in STAGES:
+                row[f"{stage} s"] = round(sum(s['ms'] for s in picked if s['Stage'] == stage) / 1000, 2)
+            per_restaurant.append(row)
+        per_restaurant.sort(key=lambda r: r['Total s'], reverse=True)
+
+        items = sum(info['items'] for info in restaurants.values())
+        return {
+            'wall_s': round(wall_s, 2),
+            'items': items,
+            'items_per_sec': round(items / wall_s, 1) if wall_s else 0,
+            'image_bytes': sum(s['Bytes'] for s in spans if s['Stage'] == 'image'),
+            'retries': sum(s['Retries'] for s in spans),
+            'stages': stages,
+            'restaurants': per_restaurant,
+        }
+
+    def export(self, folder_path):
+        # Writes timings.json (the summary) and timings.csv (every span); returns both paths
+        json_path, csv_path = (os.path.join(folder_path, name) for name in TIMING_FILES)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=1)
+        with self._lock:
+            spans = list(self.spans)
+        with open(csv_path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=SPAN_FIELDS, lineterminator=os.linesep)
+            writer.writeheader()
+            writer.writerows(spans)
+        return json_path, csv_path
+
+@contextmanager
+def track(recorder, restaurant):
+    # Binds spans opened on this thread to `restaurant` (no-op without a recorder)
+    previous = getattr(_local, 'active', None)
+    _local.active = (recorder, restaurant) if recorder else None
+    try:
+        yield
+    finally:
+        _local.active = previous
+
+def current():
+    return getattr(_local, 'active', None)
+
+@contextmanager
+def span(stage, active=None, **fields):
+    # Yields a dict the block can fill in (items, bytes, retries, ok) before the span closes
+    active = active or current()
+    started = time.monotonic()
+    ok = True
+    try:
+        yield fields
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        if active:
+            recorder, restaurant = active
+            recorder.add(stage, restaurant, (time.monotonic() - started) * 1000, **{'ok': ok, **fields})
@@ -0,0 +1,5 @@
+import re
+
+def clean_filename(text):
+    if not text: return "unknown"
+    return re.sub(r'[\\/*?:"<>|]', "", str(text)).strip()
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from menuscraper.policy import RequestPolicy
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+@pytest.fixture
+def page_html():
+    # Saved pages under tests/fixtures/, read by name
+    def load(name):
+        with open(os.path.join(FIXTURES, f"{name}.html"), encoding="utf-8") as f:
+            return f.read()
+    return load
+
+class FakeImages:
+    # Stands in for the ImageDownloader: records what would be downloaded
+    def __init__(self):
+        self.jobs = []
+        self.policy = RequestPolicy()
+
+    def submit(self, img_url, save_path, revalidate=True):
+        self.jobs.append((img_url, save_path, revalidate))
+
+@pytest.fixture
+def images():
+    return FakeImages()
@@ -0,0 +1,55 @@
+import os
+import zipfile
+
+import pytest
+
+from menuscraper import images
+from menuscraper.images import ImageDownloader
+from menuscraper.output import ArchiveWriter
+from menuscraper.thumbnails import Thumbnailer
+
+def write(path, body):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f: f.write(body)
+
+def test_add_tree_leaves_out_hardlinked_repeats(tmp_path):
+    root = str(tmp_path / "out")
+    write(os.path.join(root, "A", "Mains", "Kebab_45.jpg"), b"kebab")
+    os.makedirs(os.path.join(root, "B", "Mains"))
+    os.link(os.path.join(root, "A", "Mains", "Kebab_45.jpg"), os.path.join(root, "B", "Mains", "Kebab_45.jpg"))
+    write(os.path.join(root, "B", "Mains", "Rice_10.jpg"), b"rice")
+    write(os.path.join(root, "Menu_changes.csv"), b"report")
+
+    with ArchiveWriter(str(tmp_path / "out.zip"), root) as archive:
+        linked = archive.add_tree(root, exclude=[os.path.join(root, "Menu_changes.csv")], skip_links=True)
+    assert linked == [(os.path.join(root, "B", "Mains", "Kebab_45.jpg"), os.path.join(root, "A", "Mains", "Kebab_45.jpg"))]
+    assert sorted(zipfile.ZipFile(tmp_path / "out.zip").namelist()) == ["A/Mains/Kebab_45.jpg", "B/Mains/Rice_10.jpg"]
+
+def test_add_tree_keeps_links_by_default(tmp_path):
+    root = str(tmp_path / "out")
+    write(os.path.join(root, "a.jpg"), b"same")
+    os.link(os.path.join(root, "a.jpg"), os.path.join(root, "b.jpg"))
+    with ArchiveWriter(str(tmp_path / "out.zip"), root) as archive:
+        assert archive.add_tree(root) == []
+    assert sorted(zipfile.ZipFile(tmp_path / "out.zip").namelist()) == ["a.jpg", "b.jpg"]
+
+def test_unstaged_thumbnails_are_made_before_the_spool_is_removed(monkeypatch, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+
+    def fetch_image(session, img_url, save_path, timeout=10, revalidate=True):
+        # A distinct colour per image, so none of them is deduplicated
+        Image.new("RGB", (400, 300), (6 * int(img_url.rsplit("/", 1)[1]), 0, 0)).save(save_path, format="JPEG")
+        return os.path.getsize(save_path)
+
+    monkeypatch.setattr(images, "fetch_image", fetch_image)
+    root = str(tmp_path / "out")
+    with ArchiveWriter(str(tmp_path / "out.zip"), root) as archive:
+        thumbnailer = Thumbnailer(root, fmt="jpeg", workers=1, archive=archive, stage=False)
+        downloader = ImageDownloader(workers=4, archive=archive, stage=False, thumbnails=thumbnailer)
+        for i in range(40): downloader.submit(f"https://img.example.com/{i}", os.path.join(root, "Mains", f"{i}.jpg"))
+        downloader.close()
+        thumbnailer.close()
+    assert thumbnailer.stats['made'] == 40 and thumbnailer.stats['failed'] == 0
+    names = zipfile.ZipFile(tmp_path / "out.zip").namelist()
+    assert len([name for name in names if name.startswith("Thumbnails/")]) == 40
+    assert not os.path.exists(root)
@@ -0,0 +1,60 @@
+import pytest
+
+from menuscraper import browser
+from menuscraper.browser import BrowserPool
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    def new_context(self, **options):
+        return FakeContext()
+
+    def close(self):
+        self.closed = True
+
+class FakeContext:
+    def on(self, event, handler):
+        pass
+
+    def close(self):
+        pass
+
+class FakePlaywright:
+    # Chromium launches fail until `fail_launches` runs out
+    def __init__(self, fail_launches):
+        self.fail_launches = fail_launches
+        self.stopped = 0
+        self.chromium = self
+
+    def start(self):
+        return self
+
+    def stop(self):
+        self.stopped += 1
+
+    def launch(self, headless=True):
+        if self.fail_launches:
+            self.fail_launches -= 1
+            raise RuntimeError("Executable doesn't exist")
+        return FakeBrowser()
+
+def test_failed_launch_leaves_the_pool_restartable(monkeypatch):
+    playwright = FakePlaywright(fail_launches=1)
+    monkeypatch.setattr(browser, "ensure_browser_installed", lambda: None)
+    monkeypatch.setattr(browser, "sync_playwright", lambda: playwright)
+    pool = BrowserPool(size=2)
+
+    with pytest.raises(RuntimeError, match="Executable"):
+        with pool.context("OddMenu"):
+            pass
+    assert playwright.stopped == 1
+
+    # The next restaurant on this worker gets a fresh launch, not an IndexError
+    with pool.context("OddMenu") as context:
+        assert isinstance(context, FakeContext)
+    assert len(pool._slots) == 2
+    pool.close()
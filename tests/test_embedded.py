@@ -0,0 +1,25 @@
+from menuscraper.embedded import embedded_json_blobs
+
+def test_next_data(page_html):
+    blobs = embedded_json_blobs(page_html("oddmenu_next_data"))
+    assert len(blobs) == 1
+    menu = blobs[0]["props"]["pageProps"]["menu"]
+    assert [tab["name"] for tab in menu] == ["Tab 1", "Tab 2"]
+
+def test_json_ld(page_html):
+    blobs = embedded_json_blobs(page_html("finedine_json_ld"))
+    assert len(blobs) == 1
+    assert blobs[0]["@type"] == "Restaurant"
+    assert blobs[0]["hasMenu"]["hasMenuSection"][0]["name"] == "Starters"
+
+def test_window_state(page_html):
+    blobs = embedded_json_blobs(page_html("finedine_state"))
+    assert len(blobs) == 1
+    assert blobs[0]["restaurant"]["name"] == "Zaatar Cafe"
+
+def test_invalid_and_empty_scripts_are_skipped(page_html):
+    blobs = embedded_json_blobs(page_html("no_menu"))
+    assert blobs == [{"page": {"name": "404", "links": [{"name": "Home", "href": "/"}]}}]
+
+def test_plain_scripts_are_ignored():
+    assert embedded_json_blobs("<script>var menu = {\"name\": \"x\"};</script>") == []
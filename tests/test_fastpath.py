@@ -0,0 +1,102 @@
+import pytest
+
+from menuscraper import fastpath, scheduler
+from menuscraper.embedded import embedded_json_blobs
+from menuscraper.fastpath import find_menu_items, map_fast_path_records, scrape_fast_path
+
+URL = "https://menu.finedine.com/zaatar-cafe"
+
+def items_of(html):
+    return find_menu_items(embedded_json_blobs(html)[0])
+
+def serve(monkeypatch, html):
+    monkeypatch.setattr(fastpath, "fetch_html", lambda url, *args, **kwargs: html)
+
+def test_find_menu_items_trail_and_currency(page_html):
+    items = items_of(page_html("finedine_state"))
+    assert [node["name"] if isinstance(node["name"], str) else node["name"]["en"] for _, node, _ in items] == \
+        ["Manakish", "Foul", "Karak Tea"]
+    trail, _, currency = items[0]
+    assert trail == ["Zaatar Cafe", "Breakfast / Brunch"]
+    # Inherited from the restaurant object above the items
+    assert currency == "AED"
+
+def test_find_menu_items_json_ld_offers(page_html):
+    items = items_of(page_html("finedine_json_ld"))
+    assert [(trail, node["name"], currency) for trail, node, currency in items] == [
+        (["Sea Salt", "Dinner", "Starters"], "Calamari", "AED"),
+        (["Sea Salt", "Dinner", "Starters"], "Soup of the day", None),
+    ]
+
+def test_find_menu_items_no_menu(page_html):
+    assert items_of(page_html("no_menu")) == []
+
+def test_finedine_records(page_html):
+    records = map_fast_path_records(items_of(page_html("finedine_state")), "Zaatar Cafe", URL, "FineDine")
+    assert [(r['Category'], r['Dish'], r['Price'], r['Currency']) for r in records] == [
+        ("Breakfast  Brunch", "Manakish", "18", "AED"),
+        ("Breakfast  Brunch", "Foul", "22", "AED"),
+        ("Drinks", "Karak Tea", "7.50", "AED"),
+    ]
+    assert all(r['Tab'] == "Menu" and r['Platform'] == "FineDine" for r in records)
+    # The blur filter is stripped with or without its trailing slash
+    assert records[0]['Image URL'] == "https://cdn.finedine.com/unsafe/items/manakish.jpg"
+    assert records[2]['Image URL'] == "https://cdn.finedine.com/unsafe/items/karak.jpg"
+    assert records[0]['Dish (AR)'] == "مناقيش"
+    assert records[0]['Description'] == "Zaatar and olive oil"
+
+def test_finedine_price_without_currency(page_html):
+    records = map_fast_path_records(items_of(page_html("finedine_json_ld")), "Sea Salt", URL, "FineDine")
+    assert [(r['Price'], r['Currency'], r['Image URL']) for r in records] == [
+        ("38.00", "AED", "https://cdn.finedine.com/items/calamari.jpg"),
+        ("25", "NA", ""),
+    ]
+
+def test_oddmenu_records(page_html):
+    records = map_fast_path_records(items_of(page_html("oddmenu_next_data")), "grill-house", URL, "OddMenu")
+    assert len(records) == 8
+    assert (records[0]['Category'], records[0]['Dish'], records[0]['Price'], records[0]['Currency']) == \
+        ("Category 1-1", "Dish 1-1-1", "114", "AED")
+    assert records[-1]['Category'] == "Category 2-2"
+    # Same tabs as the browser crawler reads off the landing page
+    assert [r['Tab'] for r in records] == ["Tab 1"] * 4 + ["Tab 2"] * 4
+
+def test_restaurant_level_is_not_a_tab():
+    items = [(["Zaatar Cafe", "Drinks"], {"name": "Karak Tea", "price": 7}, None),
+             (["Zaatar Cafe", "Dinner", "Starters"], {"name": "Soup", "price": 25}, None),
+             (["Drinks"], {"name": "Water", "price": 3}, None)]
+    records = map_fast_path_records(items, "Zaatar Cafe", URL, "OddMenu")
+    assert [(r['Tab'], r['Category']) for r in records] == \
+        [("Menu", "Drinks"), ("Dinner", "Starters"), ("Menu", "Drinks")]
+
+def test_scrape_fast_path_queues_images(monkeypatch, page_html, images):
+    serve(monkeypatch, page_html("finedine_state"))
+    logs = []
+    data = scrape_fast_path(URL, "FineDine", logs.append, "/out", images)
+    assert [r['Restaurant'] for r in data] == ["Zaatar Cafe"] * 3
+    assert [url for url, _, _ in images.jobs] == [data[0]['Image URL'], data[2]['Image URL']]
+    assert logs == ["⚡ Fast path: read 3 items from embedded menu JSON"]
+
+def test_scrape_fast_path_without_menu(monkeypatch, page_html, images):
+    serve(monkeypatch, page_html("no_menu"))
+    assert scrape_fast_path(URL, "OddMenu", print, "/out", images) == []
+    serve(monkeypatch, None)
+    assert scrape_fast_path(URL, "OddMenu", print, "/out", images) == []
+    assert images.jobs == []
+
+def test_scrape_restaurant_falls_back_to_browser(monkeypatch, page_html, images):
+    serve(monkeypatch, page_html("no_menu"))
+    calls = []
+    browser_rows = [{'Dish': "From the browser"}]
+    monkeypatch.setattr(scheduler, "crawl", lambda adapter, url, *args, **kwargs: calls.append((adapter.name, url)) or browser_rows)
+    logs = []
+    data, changes = scheduler.scrape_restaurant(URL, "FineDine", logs.append, "/out", images=images, fast_path={"FineDine": True})
+    assert data == browser_rows and changes is None
+    assert calls == [("FineDine", URL)]
+    assert "Fast path unavailable, falling back to the browser" in logs
+
+def test_scrape_restaurant_skips_browser_with_embedded_menu(monkeypatch, page_html, images):
+    serve(monkeypatch, page_html("finedine_state"))
+    monkeypatch.setattr(scheduler, "crawl", lambda *args, **kwargs: pytest.fail("the browser should not be launched"))
+    data, _ = scheduler.scrape_restaurant(URL, "FineDine", print, "/out", images=images, fast_path={"FineDine": True})
+    assert len(data) == 3
@@ -0,0 +1,64 @@
+import requests
+
+from menuscraper import embedded
+from menuscraper.embedded import fetch_html
+from menuscraper.policy import RequestPolicy
+from menuscraper.state import http_fingerprint
+
+URL = "https://menu.oddmenu.com/grill-house"
+
+class FakeSession:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def get(self, url, timeout, headers):
+        self.calls.append((url, timeout))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception): raise outcome
+        response = requests.Response()
+        response.status_code, response._content = outcome
+        return response
+
+def test_fetch_goes_through_the_policy(monkeypatch):
+    session = FakeSession((200, b"<html>menu</html>"))
+    monkeypatch.setattr(embedded, "_session", session)
+    policy = RequestPolicy()
+    assert fetch_html(URL, policy) == "<html>menu</html>"
+    assert session.calls == [(URL, 15.0)]
+    assert policy.drain_issues() == []
+
+def test_failures_are_recorded(monkeypatch):
+    monkeypatch.setattr(embedded, "_session", FakeSession((404, b""), requests.Timeout("read timed out")))
+    policy = RequestPolicy()
+    assert fetch_html(URL, policy, "Grill House", "Tab 1 / Mains") is None
+    assert fetch_html(URL, policy, "Grill House", "Tab 1 / Mains") is None
+    assert [(i['Restaurant'], i['Issue'], i['Stage'], i['Target'], i['Detail']) for i in policy.drain_issues()] == [
+        ("Grill House", 'failed', 'fetch', "Tab 1 / Mains", "HTTP 404"),
+        ("Grill House", 'failed', 'fetch', "Tab 1 / Mains", "read timed out"),
+    ]
+
+def test_fingerprint_probe_misses_are_not_issues(monkeypatch):
+    monkeypatch.setattr(embedded, "_session", FakeSession((404, b""), (403, b""), requests.Timeout("read timed out")))
+    policy = RequestPolicy()
+    assert [http_fingerprint(URL, policy) for _ in range(3)] == [None, None, None]
+    assert policy.drain_issues() == []
+
+def test_timeout_follows_the_p95_latency():
+    policy = RequestPolicy()
+    for latency_ms in range(1000, 21000, 1000): policy.success(URL, "fetch", latency_ms)
+    # Nearest-rank p95 of 20 samples is the 19th, times TIMEOUT_FACTOR
+    assert policy.timeout_ms(URL, "fetch", 120000) == 19000 * 4
+    assert policy.timeout_ms(URL, "fetch", 15000) == 15000
+
+def test_server_errors_open_the_breaker(monkeypatch):
+    session = FakeSession(*[(503, b"")] * 2)
+    monkeypatch.setattr(embedded, "_session", session)
+    policy = RequestPolicy(breaker_failures=2, breaker_cooldown=60)
+    assert fetch_html(URL, policy) is None
+    assert fetch_html(URL, policy) is None
+    # The host is paused: no request is sent
+    assert fetch_html(URL, policy) is None
+    assert len(session.calls) == 2
+    assert [i['Issue'] for i in policy.drain_issues()] == ['failed', 'failed', 'skipped']
+    assert policy.stats['breaker_opened'] == 1
@@ -0,0 +1,49 @@
+import threading
+
+from menuscraper.images import ImageCache
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, body):
+        self.body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+class BarrierSession:
+    # Holds every request until all callers are inside get(), so their cache misses overlap
+    def __init__(self, callers, body):
+        self.barrier = threading.Barrier(callers)
+        self.body = body
+
+    def get(self, url, **kwargs):
+        self.barrier.wait(timeout=5)
+        return FakeResponse(self.body)
+
+def test_concurrent_misses_count_bytes_once(tmp_path):
+    cache = ImageCache(root=str(tmp_path / "cache"), max_bytes=10_000)
+    session = BarrierSession(2, b"x" * 1000)
+    threads = [threading.Thread(target=cache.fetch, args=(session, "https://img.example.com/a.jpg", str(tmp_path / f"{i}.jpg")))
+               for i in range(2)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert cache.stats['misses'] == 2
+    assert cache.total_bytes == 1000
+    cache.close()
+
+def test_eviction_keeps_newest(tmp_path):
+    cache = ImageCache(root=str(tmp_path / "cache"), max_bytes=2500)
+    session = BarrierSession(1, b"x" * 1000)
+    for i in range(4):
+        cache.fetch(session, f"https://img.example.com/{i}.jpg", str(tmp_path / f"{i}.jpg"))
+    assert cache.total_bytes == 2000
+    assert cache.stats['evicted'] == 2
+    cache.close()
@@ -0,0 +1,28 @@
+from menuscraper.manifest import JobManifest
+
+JOBS = [(0, "https://a.finedine.com/r", "FineDine"), (1, "https://b.oddmenu.com/r", "OddMenu")]
+
+def test_done_jobs_are_skipped_on_resume(tmp_path):
+    manifest = JobManifest(str(tmp_path))
+    assert manifest.plan(JOBS) == JOBS
+    manifest.mark(0, 'done', positions={'csv': 120}, rows=3, csv="A_FineDine.csv")
+    manifest.mark(1, 'failed', error="timeout")
+
+    resumed = JobManifest.load(str(tmp_path))
+    assert resumed.plan(JOBS) == JOBS[1:]
+    assert resumed.positions == {'csv': 120}
+    assert resumed.rows() == 3
+
+def test_pending_images_survive_a_restart(tmp_path):
+    manifest = JobManifest(str(tmp_path))
+    manifest.plan(JOBS)
+    pending = [["https://img.example.com/1.jpg", "A/Mains/Dish_45.jpg", True]]
+    manifest.mark(0, 'done', positions={}, images=pending, rows=1)
+    assert JobManifest.load(str(tmp_path)).images == pending
+
+    manifest.set_images([])
+    assert JobManifest.load(str(tmp_path)).images == []
+
+def test_missing_manifest_loads_empty(tmp_path):
+    manifest = JobManifest.load(str(tmp_path))
+    assert manifest.images == [] and manifest.positions == {}
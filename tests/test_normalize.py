@@ -0,0 +1,49 @@
+import pytest
+
+from menuscraper.normalize import normalize_records
+from menuscraper.platforms import ADAPTERS
+
+def row(price, currency="", dish="Kebab", **fields):
+    return dict({'Source': "https://a.oddmenu.com/r", 'Tab': "Menu", 'Category': "Mains", 'Dish': dish,
+                 'Price': price, 'Currency': currency}, **fields)
+
+@pytest.mark.parametrize("price, currency, expected_price, expected_currency", [
+    ("45", "AED", 45.0, "AED"),
+    ("AED 12.5", "", 12.5, "AED"),
+    ("1,250.00", "NA", 1250.0, ""),
+    ("٤٥", "د.إ", 45.0, "AED"),
+    ("1.250,00", "EUR", 1250.0, "EUR"),
+    ("12,50 €", "", 12.5, "EUR"),
+    ("1.250", "EUR", 1250.0, "EUR"),
+    ("1.250", "AED", 1.25, "AED"),
+    ("1,250", "EUR", 1.25, "EUR"),
+    ("1,250", "KWD", 1250.0, "KWD"),
+    ("1.2.5,0", "EUR", None, "EUR"),
+    ("Market price", "NA", None, ""),
+    ("", "", None, ""),
+])
+def test_prices_and_currencies(price, currency, expected_price, expected_currency):
+    [record] = normalize_records([row(price, currency)])
+    assert record['Price'] == expected_price
+    assert record['Currency'] == expected_currency
+
+@pytest.mark.parametrize("price_full, expected_price, expected_currency", [
+    ("AED 45.00", 45.0, "AED"),
+    ("AED 1,250.00", 1250.0, "AED"),
+    ("1,250.00 SAR", 1250.0, "SAR"),
+    ("€ 12,50", 12.5, "EUR"),
+    ("NA", 0.0, ""),
+])
+def test_finedine_prices_survive_the_adapter(price_full, expected_price, expected_currency):
+    item = {'name': "Kebab", 'description': "", 'price_full': price_full, 'img': ""}
+    adapted = ADAPTERS["FineDine"].normalize(item, "Sea Salt", "Menu", "Mains", "https://menu.finedine.com/sea-salt")
+    [record] = normalize_records([adapted])
+    assert (record['Price'], record['Currency']) == (expected_price, expected_currency)
+
+def test_arabic_is_split_from_bilingual_names():
+    [record] = normalize_records([row("18", "AED", dish="Hummus  حمص")])
+    assert (record['Dish'], record['Dish (AR)']) == ("Hummus", "حمص")
+
+def test_repeats_within_a_category_are_dropped():
+    records = normalize_records([row("45", "AED"), row("45.0", "AED"), row("45", "AED", Category="Grill")])
+    assert [r['Category'] for r in records] == ["Mains", "Grill"]
@@ -0,0 +1,29 @@
+import pytest
+
+from menuscraper.engine import PLATFORM_FILTERS
+from menuscraper.platforms import ADAPTERS
+from menuscraper.scheduler import detect_platform
+
+@pytest.mark.parametrize("url, platform", [
+    ("https://oddmenu.com/grill-house", "OddMenu"),
+    ("https://app.oddmenu.com/grill-house?lang=en", "OddMenu"),
+    ("HTTPS://Menu.FineDineMenu.com/zaatar", "FineDine"),
+    ("menu.finedine.com/zaatar", "FineDine"),
+    ("  https://app.oddmenu.com/r  ", "OddMenu"),
+    # Only the host counts, not the rest of the URL
+    ("https://example.com/?ref=finedine", None),
+    ("https://example.com/oddmenu/grill-house", None),
+    ("https://notoddmenu.com/r", None),
+    ("https://oddmenu.com.evil.example/r", None),
+    ("", None),
+])
+def test_detect_platform_by_host(url, platform):
+    assert detect_platform(url) == platform
+
+def test_registry_drives_the_filters():
+    assert set(ADAPTERS) == {"OddMenu", "FineDine"}
+    assert PLATFORM_FILTERS == {"all": None, "oddmenu": "OddMenu", "finedine": "FineDine"}
+
+def test_context_options():
+    assert set(ADAPTERS["OddMenu"].context_options()) == {'user_agent'}
+    assert ADAPTERS["FineDine"].context_options() == {}
@@ -0,0 +1,24 @@
+import pytest
+
+from menuscraper.timing import SpanRecorder, percentile, span, track
+
+@pytest.mark.parametrize("values, pct, expected", [
+    ([1, 2, 3, 4, 5], 50, 3),
+    ([1, 2, 3, 4], 50, 2),
+    ([5, 1, 4, 2, 3], 95, 5),
+    (list(range(1, 21)), 95, 19),
+    (list(range(1, 101)), 50, 50),
+    ([7], 95, 7),
+    ([], 50, 0),
+])
+def test_nearest_rank_percentile(values, pct, expected):
+    assert percentile(values, pct) == expected
+
+def test_spans_are_recorded_per_restaurant():
+    recorder = SpanRecorder()
+    with track(recorder, "https://a.oddmenu.com/r"):
+        with span("extract") as stage:
+            stage['items'] = 4
+    with span("extract"):
+        pass   # Nothing bound on this thread: not recorded
+    assert [(s['Restaurant'], s['Stage'], s['Items']) for s in recorder.spans] == [("https://a.oddmenu.com/r", "extract", 4)]